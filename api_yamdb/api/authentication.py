@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .cache import TOKEN_VERSION_KEY
+
+User = get_user_model()
+
+VERSION_CLAIM = 'ver'
+USER_CLAIMS = {
+    'username': 'username',
+    'role': 'role',
+    'is_staff': 'is_staff',
+    'token_version': VERSION_CLAIM,
+}
+REVOKED = -1
+# Кэш в памяти процесса узнаёт об отзыве токенов из других процессов
+# только после истечения записи, поэтому срок короткий.
+TOKEN_VERSION_TIMEOUT = getattr(settings, 'API_TOKEN_VERSION_TIMEOUT', 30)
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов пользователя.
+
+    Берётся из кэша, а при промахе - из базы данных. Для удалённых
+    и неактивных пользователей возвращается REVOKED. Запись в кэше
+    живёт TOKEN_VERSION_TIMEOUT секунд, так что отзыв токенов доходит
+    до всех процессов не позже этого срока.
+    """
+
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is None:
+            version = REVOKED
+        cache.add(key, version, TOKEN_VERSION_TIMEOUT)
+    return version
+
+
+def set_token_version(user_id, version):
+    """Записывает в кэш версию токенов после изменения пользователя."""
+
+    cache.set(
+        TOKEN_VERSION_KEY.format(user_id=user_id),
+        version,
+        TOKEN_VERSION_TIMEOUT
+    )
+
+
+class UserAccessToken(AccessToken):
+    """Access-токен с именем, ролью и версией токенов пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field, claim in USER_CLAIMS.items():
+            token[claim] = getattr(user, field)
+        return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя из базы данных.
+
+    Пользователь собирается из утверждений UserAccessToken, а отзыв
+    токенов проверяется по версии из кэша: она меняется при смене
+    имени, роли или статуса пользователя и при его удалении.
+    Токены без этих утверждений проверяются как в JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+            values = {
+                field: validated_token[claim]
+                for field, claim in USER_CLAIMS.items()
+            }
+        except KeyError:
+            return super().get_user(validated_token)
+
+        if get_token_version(user_id) != values['token_version']:
+            raise AuthenticationFailed(
+                'Токен отозван.', code='token_revoked'
+            )
+        values[api_settings.USER_ID_FIELD] = user_id
+        values['is_active'] = True
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            User.objects.db,
+            field_names,
+            [values[name] for name in field_names]
+        )
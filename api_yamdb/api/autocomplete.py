@@ -0,0 +1,139 @@
+"""
+Индексы для подсказок по началу слова.
+
+Каждый индекс - отсортированный в памяти процесса список пар
+(хвост названия, начинающийся с очередного слова, pk), поэтому
+поиск по префиксу - это бинарный поиск и чтение соседних элементов.
+Индексы обновляются на месте при записи в этом процессе; изменения
+из других процессов обнаруживаются по версии собственного пространства
+имён кэша индекса (см. `api.cache`), после чего индекс перестраивается
+целиком. Версия меняется только при создании и удалении объектов
+и изменении индексируемых полей, а не при любой записи в модель.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from .cache import get_version
+from reviews.models import Category, Genre, Title
+
+REBUILD_INTERVAL = 300
+MAX_LIMIT = 20
+WORD_START = re.compile(r'(?<!\w)\w')
+
+
+def normalize(text):
+    return text.casefold()
+
+
+class PrefixIndex:
+    """Индекс названий одной модели для поиска по префиксу слова."""
+
+    def __init__(self, model, namespace, fields):
+        self.model = model
+        self.namespace = namespace
+        self.fields = fields
+        self.keys = []
+        self.items = {}
+        self.version = None
+        self.built_at = 0
+        self.lock = threading.Lock()
+
+    def get_entries(self, name):
+        name = normalize(name)
+        return {name[match.start():] for match in WORD_START.finditer(name)}
+
+    def get_values(self, instance):
+        """Загруженные значения индексируемых полей объекта."""
+
+        return {field: instance.__dict__.get(field) for field in self.fields}
+
+    def _add(self, item):
+        pk = item['id']
+        self._remove(pk)
+        entries = self.get_entries(item['name'])
+        for entry in entries:
+            insort(self.keys, (entry, pk))
+        self.items[pk] = (entries, item)
+
+    def _remove(self, pk):
+        entries, _ = self.items.pop(pk, ((), None))
+        for entry in entries:
+            position = bisect_left(self.keys, (entry, pk))
+            del self.keys[position]
+
+    def rebuild(self):
+        """Строит индекс заново по данным из базы."""
+
+        version = get_version(self.namespace)
+        items = self.model.objects.values(
+            *dict.fromkeys(('id', *self.fields))
+        ).order_by()
+        with self.lock:
+            self.keys = []
+            self.items = {}
+            for item in items:
+                entries = self.get_entries(item['name'])
+                self.keys.extend((entry, item['id']) for entry in entries)
+                self.items[item['id']] = (entries, item)
+            self.keys.sort()
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def update(self, pk, item, version):
+        """
+        Применяет изменение одного объекта, сделанное в этом процессе.
+
+        item - новые значения полей или None, если объект удалён;
+        version - версия пространства имён до изменения. Если индекс
+        отстал от неё, изменение не применяется и индекс перестроится
+        при следующем поиске.
+        """
+
+        with self.lock:
+            if self.version != version:
+                self.version = None
+                return
+            if item is None:
+                self._remove(pk)
+            else:
+                self._add({'id': pk, **item})
+            self.version = get_version(self.namespace)
+
+    def is_stale(self):
+        return (
+            self.version is None
+            or time.monotonic() - self.built_at > REBUILD_INTERVAL
+            or self.version != get_version(self.namespace)
+        )
+
+    def search(self, prefix, limit):
+        """Объекты, одно из слов названия которых начинается с prefix."""
+
+        if self.is_stale():
+            self.rebuild()
+        prefix = normalize(prefix)
+        found = {}
+        with self.lock:
+            position = bisect_left(self.keys, (prefix,))
+            while position < len(self.keys) and len(found) < limit:
+                entry, pk = self.keys[position]
+                if not entry.startswith(prefix):
+                    break
+                found.setdefault(pk, self.items[pk][1])
+                position += 1
+        return [
+            {field: item[field] for field in self.fields}
+            for item in found.values()
+        ]
+
+
+INDEXES = {
+    'titles': PrefixIndex(Title, 'autocomplete:titles', ('id', 'name')),
+    'genres': PrefixIndex(Genre, 'autocomplete:genres', ('slug', 'name')),
+    'categories': PrefixIndex(
+        Category, 'autocomplete:categories', ('slug', 'name')
+    ),
+}
+MODEL_INDEXES = {index.model: index for index in INDEXES.values()}
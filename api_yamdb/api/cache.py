@@ -0,0 +1,142 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import quote_etag
+
+NAMESPACES = ('titles', 'categories', 'genres')
+REVIEWS_NAMESPACE = 'reviews:{title_id}'
+COMMENTS_NAMESPACE = 'comments:{review_id}'
+USERS_NAMESPACE = 'users'
+CACHE_TIMEOUT = getattr(settings, 'API_CACHE_TIMEOUT', 300)
+
+VERSION_KEY = 'api:version:{namespace}'
+RESPONSE_KEY = 'api:response:{namespace}:{version}:{params}'
+COUNT_KEY = 'api:count:{namespace}:{version}:{params}'
+STATS_KEY = 'api:stats:{namespace}:{event}'
+TOKEN_VERSION_KEY = 'api:token_version:{user_id}'
+HIT = 'hits'
+MISS = 'misses'
+
+
+def get_version(namespace):
+    """
+    Текущая версия пространства имён кэша.
+
+    Версия - момент последнего изменения данных, поэтому подходит
+    и для сравнения, и для заголовка Last-Modified.
+    """
+
+    key = VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*namespaces):
+    """
+    Делает устаревшими все ответы указанных пространств имён.
+
+    Версия меняется после фиксации транзакции, чтобы параллельный
+    запрос не закэшировал старые данные под новой версией.
+    """
+
+    def bump():
+        now = time.time()
+        cache.set_many({
+            VERSION_KEY.format(namespace=namespace): now
+            for namespace in namespaces
+        }, None)
+
+    transaction.on_commit(bump)
+
+
+def get_request_digest(request, *extra, ignored_params=()):
+    """Хэш пути и параметров запроса, кроме ignored_params."""
+
+    params = sorted(
+        (key, sorted(values)) for key, values in request.query_params.lists()
+        if key not in ignored_params
+    )
+    return hashlib.md5(
+        f'{request.path}?{params}{extra}'.encode()
+    ).hexdigest()
+
+
+def get_response_key(namespace, request):
+    """Ключ ответа: версия, путь и полный набор параметров запроса."""
+
+    return RESPONSE_KEY.format(
+        namespace=namespace,
+        version=get_version(namespace),
+        params=get_request_digest(request)
+    )
+
+
+def get_count_key(namespace, request, ignored_params=()):
+    """
+    Ключ количества объектов списка.
+
+    Не зависит от параметров пагинации и выбора полей (ignored_params),
+    поэтому все страницы одной выборки используют одно значение.
+    """
+
+    return COUNT_KEY.format(
+        namespace=namespace,
+        version=get_version(namespace),
+        params=get_request_digest(request, ignored_params=ignored_params)
+    )
+
+
+def get_validators(namespaces, request):
+    """
+    ETag и Last-Modified ответа, зависящего от пространств имён.
+
+    Вычисляются только по версиям из кэша, без обращения к базе данных.
+    """
+
+    keys = {
+        VERSION_KEY.format(namespace=namespace): namespace
+        for namespace in namespaces
+    }
+    versions = {
+        keys[key]: version for key, version in cache.get_many(keys).items()
+    }
+    for namespace in set(namespaces) - set(versions):
+        versions[namespace] = get_version(namespace)
+    versions = sorted(versions.items())
+    return {
+        'etag': quote_etag(get_request_digest(
+            request, versions, request.accepted_renderer.format
+        )),
+        'last_modified': int(max(version for _, version in versions)),
+    }
+
+
+def count_event(namespace, event):
+    """Увеличивает счётчик попаданий или промахов кэша."""
+
+    key = STATS_KEY.format(namespace=namespace, event=event)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_stats():
+    """Счётчики попаданий и промахов по пространствам имён."""
+
+    keys = {
+        (namespace, event): STATS_KEY.format(namespace=namespace, event=event)
+        for namespace in NAMESPACES
+        for event in (HIT, MISS)
+    }
+    values = cache.get_many(keys.values())
+    stats = {namespace: {} for namespace in NAMESPACES}
+    for (namespace, event), key in keys.items():
+        stats[namespace][event] = values.get(key, 0)
+    return stats
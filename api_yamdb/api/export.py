@@ -0,0 +1,90 @@
+from django.db.models import Q
+
+from api.lean import LeanReviewSerializer, LeanTitleSerializer
+from api.renderers import FastJSONRenderer
+from reviews.models import Review, Title
+
+EXPORT_CHUNK_SIZE = 500
+REVIEW_ORDERING = ('title_id', 'pub_date', 'id')
+
+
+def iter_titles(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Все произведения каталога с категорией, жанрами и рейтингом
+    порциями по chunk_size.
+
+    Произведения выбираются порциями по первичному ключу, поэтому
+    память не зависит от размера каталога, а первая порция
+    отдаётся сразу.
+    """
+
+    last_pk = 0
+    while True:
+        serializer = LeanTitleSerializer()
+        titles = serializer.to_representation(serializer.get_queryset(
+            Title.objects.filter(pk__gt=last_pk).order_by('pk')
+        )[:chunk_size])
+        if not titles:
+            return
+        yield titles
+        last_pk = titles[-1]['id']
+
+
+def iter_reviews(title_ids, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Отзывы произведений title_ids парами (id произведения, отзыв).
+
+    Отзывы выбираются порциями по ключу (title_id, pub_date, id),
+    поэтому в памяти не больше chunk_size отзывов, сколько бы их
+    ни было у одного произведения.
+    """
+
+    serializer = LeanReviewSerializer()
+    position = None
+    while True:
+        queryset = Review.objects.filter(title_id__in=title_ids)
+        if position is not None:
+            title_id, pub_date, pk = position
+            queryset = queryset.filter(
+                Q(title_id__gt=title_id)
+                | Q(title_id=title_id, pub_date__gt=pub_date)
+                | Q(title_id=title_id, pub_date=pub_date, id__gt=pk)
+            )
+        rows = list(serializer.get_queryset(
+            queryset.order_by(*REVIEW_ORDERING), REVIEW_ORDERING
+        )[:chunk_size])
+        if not rows:
+            return
+        yield from zip(
+            (row['title_id'] for row in rows),
+            serializer.to_representation(rows)
+        )
+        position = tuple(rows[-1][field] for field in REVIEW_ORDERING)
+
+
+def iter_ndjson(with_reviews=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Каталог в формате NDJSON, по одной строке на произведение.
+
+    С with_reviews строка произведения выводится по частям: сначала
+    поля произведения, затем его отзывы по одному, поэтому отзывы
+    не собираются в памяти целиком.
+    """
+
+    renderer = FastJSONRenderer()
+    for titles in iter_titles(chunk_size):
+        if not with_reviews:
+            for title in titles:
+                yield renderer.render(title) + b'\n'
+            continue
+        reviews = iter_reviews([title['id'] for title in titles], chunk_size)
+        review = next(reviews, None)
+        for title in titles:
+            # Поле reviews последнее: строка без закрывающих `]}`.
+            yield renderer.render({**title, 'reviews': []})[:-2]
+            separator = b''
+            while review is not None and review[0] == title['id']:
+                yield separator + renderer.render(review[1])
+                separator = b','
+                review = next(reviews, None)
+            yield b']}\n'
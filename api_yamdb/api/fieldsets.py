@@ -0,0 +1,52 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_field_names(request, param):
+    """Имена полей из параметра запроса, перечисленные через запятую."""
+
+    value = request.query_params.get(param, '')
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def filter_field_names(request, names):
+    """
+    Имена полей из names, которые попадут в ответ.
+
+    Параметр `fields` оставляет только перечисленные поля, `omit`
+    исключает перечисленные. Запросы на запись не ограничиваются.
+    """
+
+    if request is None or request.method not in SAFE_METHODS:
+        return list(names)
+    fields = parse_field_names(request, FIELDS_PARAM)
+    omit = parse_field_names(request, OMIT_PARAM)
+    return [
+        name for name in names
+        if (not fields or name in fields) and name not in omit
+    ]
+
+
+class SparseFieldsMixin:
+    """
+    Выбор полей ответа сериализатора параметрами `fields` и `omit`.
+
+    Действует только на сериализатор верхнего уровня, вложенные
+    сериализаторы всегда отдаются целиком.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if parent is not None and not (
+            isinstance(parent, ListSerializer) and parent.parent is None
+        ):
+            return fields
+        request = self.context.get('request')
+        return {
+            name: fields[name]
+            for name in filter_field_names(request, fields)
+        }
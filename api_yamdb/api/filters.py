@@ -1,6 +1,25 @@
 import django_filters as filters
+from django.db.models import Count
 
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+from reviews.search import search_titles
+
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
+MATCH_CHOICES = (
+    (MATCH_ANY, 'Хотя бы один из слагов'),
+    (MATCH_ALL, 'Все слаги'),
+)
+
+TITLE_ORDERINGS = {
+    '-rating': ('-rating', 'id'),
+    '-reviews_count': ('-reviews_count', 'id'),
+}
+DEFAULT_TITLE_ORDERING = '-rating'
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Фильтр по списку значений, перечисленных через запятую."""
 
 
 class TitleFilter(filters.FilterSet):
@@ -8,28 +27,87 @@ class TitleFilter(filters.FilterSet):
     Фильтр для модели Title.
 
     Позволяет выполнять поиск произведений по следующим параметрам:
-    - category: точное совпадение по слагу категории.
-    - genre: точное совпадение по слагу жанра.
+    - category: слаги категорий через запятую.
+    - genre: слаги жанров через запятую.
+    - category_match, genre_match: `any` (по умолчанию) - произведение
+      подходит, если совпал хотя бы один слаг, `all` - если совпали все.
     - name: частичное совпадение по названию произведения.
     - year: точное совпадение по году выпуска.
+    - search: полнотекстовый поиск по названию и описанию
+      с учётом префиксов, результаты упорядочены по релевантности,
+      поэтому с курсорной пагинацией поиск не используется.
+    - ordering: `-rating` (по умолчанию) или `-reviews_count`,
+      для каждой сортировки есть индекс (поле, id).
+
+    Условия по жанрам проверяются подзапросом к таблице связей
+    (для `all` - с группировкой и HAVING COUNT), поэтому строки
+    произведений не размножаются соединениями.
     """
 
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='exact',
-        help_text='Фильтрация по слагу категории'
+    category = CharInFilter(
+        method='filter_category',
+        help_text='Фильтрация по слагам категорий'
+    )
+    category_match = filters.ChoiceFilter(
+        choices=MATCH_CHOICES,
+        method='filter_match',
+        help_text='Совпадение с любой (any) или всеми (all) категориями'
     )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='exact',
-        help_text='Фильтрация по слагу жанра'
+    genre = CharInFilter(
+        method='filter_genre',
+        help_text='Фильтрация по слагам жанров'
+    )
+    genre_match = filters.ChoiceFilter(
+        choices=MATCH_CHOICES,
+        method='filter_match',
+        help_text='Совпадение с любым (any) или всеми (all) жанрами'
     )
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains',
         help_text='Частичная фильтрация по названию произведения'
     )
+    search = filters.CharFilter(
+        method='filter_search',
+        help_text='Полнотекстовый поиск по названию и описанию'
+    )
+    ordering = filters.ChoiceFilter(
+        choices=[(ordering, ordering) for ordering in TITLE_ORDERINGS],
+        method='filter_ordering',
+        help_text='Сортировка по рейтингу или количеству отзывов'
+    )
 
     class Meta:
         model = Title
-        fields = ['category', 'genre', 'name', 'year']
+        fields = [
+            'category', 'category_match', 'genre', 'genre_match',
+            'name', 'year', 'search', 'ordering'
+        ]
+
+    def get_match(self, name):
+        return self.form.cleaned_data.get(f'{name}_match') or MATCH_ANY
+
+    def filter_match(self, queryset, name, value):
+        return queryset
+
+    def filter_ordering(self, queryset, name, value):
+        return queryset.order_by(*TITLE_ORDERINGS[value])
+
+    def filter_category(self, queryset, name, value):
+        slugs = set(value)
+        # У произведения одна категория, все из нескольких не совпадут.
+        if self.get_match(name) == MATCH_ALL and len(slugs) > 1:
+            return queryset.none()
+        return queryset.filter(category__slug__in=slugs)
+
+    def filter_genre(self, queryset, name, value):
+        slugs = set(value)
+        title_ids = GenreTitle.objects.filter(genre__slug__in=slugs)
+        if self.get_match(name) == MATCH_ALL and len(slugs) > 1:
+            title_ids = title_ids.values('title_id').annotate(
+                matched=Count('genre_id')
+            ).filter(matched=len(slugs))
+        return queryset.filter(id__in=title_ids.values('title_id'))
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
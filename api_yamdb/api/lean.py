@@ -0,0 +1,148 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from api.fieldsets import filter_field_names
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer, UserCommentSerializer,
+                             UserReviewSerializer)
+from reviews.models import Genre, GenreTitle
+
+
+class LeanSerializer:
+    """
+    Сериализация списка объектов из строк `.values()`.
+
+    Отдаёт те же словари, что и `serializer_class`, но без создания
+    экземпляров моделей и вызова `to_representation` для каждого поля.
+    Подходит только для чтения.
+
+    `columns` сопоставляет полю ответа колонки `.values()`, значение
+    поля берётся методом `get_<поле>` или из первой колонки.
+    """
+
+    serializer_class = None
+    columns = {}
+
+    def __init__(self, request=None):
+        self.fields = filter_field_names(
+            request, self.serializer_class.Meta.fields
+        )
+        self.getters = [
+            (name, getattr(self, f'get_{name}', None)) for name in self.fields
+        ]
+
+    def get_queryset(self, queryset, ordering=()):
+        """Выборка только нужных колонок, включая поля сортировки."""
+
+        columns = {
+            column for name in self.fields for column in self.columns[name]
+        }
+        columns.update(order.lstrip('-') for order in ordering)
+        columns.update(queryset.query.extra)
+        return queryset.prefetch_related(None).values(*columns)
+
+    def prepare(self, rows):
+        """Загрузка связанных данных сразу для всех строк."""
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        return [
+            {
+                name: getter(row) if getter else row[self.columns[name][0]]
+                for name, getter in self.getters
+            }
+            for row in rows
+        ]
+
+
+class LeanTitleSerializer(LeanSerializer):
+    serializer_class = TitleReadSerializer
+    columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating', 'reviews_count'),
+        'reviews_count': ('reviews_count',),
+        'description': ('description',),
+        'genre': ('id',),
+        'category': ('category__name', 'category__slug'),
+    }
+
+    def prepare(self, rows):
+        self.genres = defaultdict(list)
+        if 'genre' not in self.fields:
+            return
+        for row in GenreTitle.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by(
+            *(f'genre__{order}' for order in Genre._meta.ordering)
+        ).values('title_id', 'genre__name', 'genre__slug'):
+            self.genres[row['title_id']].append(
+                {'name': row['genre__name'], 'slug': row['genre__slug']}
+            )
+
+    def get_rating(self, row):
+        if not row['reviews_count']:
+            return None
+        return int(row['rating'])
+
+    def get_genre(self, row):
+        return self.genres[row['id']]
+
+    def get_category(self, row):
+        if row['category__slug'] is None:
+            return None
+        return {'name': row['category__name'], 'slug': row['category__slug']}
+
+
+class LeanTextSerializer(LeanSerializer):
+    datetime_field = serializers.DateTimeField()
+
+    def get_pub_date(self, row):
+        return self.datetime_field.to_representation(row['pub_date'])
+
+
+class LeanReviewSerializer(LeanTextSerializer):
+    serializer_class = ReviewSerializer
+    columns = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+        'comments_count': ('comments_count',),
+    }
+
+
+class LeanCommentSerializer(LeanTextSerializer):
+    serializer_class = CommentSerializer
+    columns = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+
+
+class LeanUserReviewSerializer(LeanReviewSerializer):
+    serializer_class = UserReviewSerializer
+    columns = {
+        **LeanReviewSerializer.columns,
+        'title': ('title_id', 'title__name'),
+    }
+
+    def get_title(self, row):
+        return {'id': row['title_id'], 'name': row['title__name']}
+
+
+class LeanUserCommentSerializer(LeanCommentSerializer):
+    serializer_class = UserCommentSerializer
+    columns = {
+        **LeanCommentSerializer.columns,
+        'review': ('review_id', 'review__title_id'),
+    }
+
+    def get_review(self, row):
+        return {'id': row['review_id'], 'title': row['review__title_id']}
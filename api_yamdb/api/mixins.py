@@ -1,4 +1,13 @@
-from rest_framework import viewsets, mixins
+from django.core.cache import cache
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import mixins, status, viewsets
+from rest_framework.response import Response
+
+from .cache import (CACHE_TIMEOUT, HIT, MISS, count_event,
+                    get_response_key, get_validators)
+from .fieldsets import filter_field_names
 
 
 class BasicActionsViewSet(
@@ -15,3 +24,131 @@ class BasicActionsViewSet(
     - list (GET): Получение списка объектов
     - destroy (DELETE): Удаление объекта
     """
+
+
+class CachedListMixin:
+    """
+    Кэширует ответы на запросы списка объектов.
+
+    Ключ включает версию пространства имён `cache_namespace` и все
+    параметры запроса (фильтры, поиск, пагинацию). Версия меняется
+    при записи в зависимые модели, см. `api.signals`.
+    """
+
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        key = get_response_key(self.cache_namespace, request)
+        data = cache.get(key)
+        if data is not None:
+            count_event(self.cache_namespace, HIT)
+            return Response(data)
+
+        count_event(self.cache_namespace, MISS)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, CACHE_TIMEOUT)
+        return response
+
+
+class NotModified(Exception):
+    """Ресурс не изменился с момента, указанного в условном запросе."""
+
+
+class ConditionalGetMixin:
+    """
+    Поддержка условных GET-запросов (If-None-Match, If-Modified-Since).
+
+    ETag и Last-Modified вычисляются по версиям пространств имён
+    кэша из `get_cache_namespaces`, поэтому ответ 304 отдаётся
+    до выборки из базы данных и сериализации.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+    conditional_validators = None
+
+    def get_cache_namespaces(self):
+        return (self.cache_namespace,)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_validators = None
+        if (
+            request.method in ('GET', 'HEAD')
+            and self.action in self.conditional_actions
+        ):
+            self.conditional_validators = get_validators(
+                self.get_cache_namespaces(), request
+            )
+            if get_conditional_response(
+                request, **self.conditional_validators
+            ) is not None:
+                raise NotModified
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return HttpResponseNotModified()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        validators = self.conditional_validators
+        if validators and response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = validators['etag']
+            response['Last-Modified'] = http_date(
+                validators['last_modified']
+            )
+        return response
+
+
+class SparseFieldsQuerysetMixin:
+    """
+    Не загружает из базы поля, исключённые параметрами `fields` и `omit`.
+
+    Связи из `sparse_prefetch` подгружаются, только если попадут в ответ,
+    а поля из `sparse_defer` (длинные тексты) иначе откладываются.
+    """
+
+    sparse_prefetch = ()
+    sparse_defer = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        prefetch = filter_field_names(self.request, self.sparse_prefetch)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        deferred = set(self.sparse_defer).difference(
+            filter_field_names(self.request, self.sparse_defer)
+        )
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+
+class LeanListMixin:
+    """
+    Список объектов через `lean_serializer_class` из строк `.values()`.
+
+    Без `lean_serializer_class` список формирует обычный сериализатор.
+    """
+
+    lean_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.lean_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.lean_serializer_class(request)
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset()),
+            getattr(self, 'cursor_ordering', ())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(queryset))
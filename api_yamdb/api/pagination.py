@@ -0,0 +1,227 @@
+import json
+from functools import partial
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+
+from .cache import CACHE_TIMEOUT, get_count_key
+from .fieldsets import FIELDS_PARAM, OMIT_PARAM
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который хранит количество объектов в кэше по count_key."""
+
+    def __init__(self, *args, count_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return Paginator.count.func(self)
+        count = cache.get(self.count_key)
+        if count is None:
+            count = Paginator.count.func(self)
+            cache.set(self.count_key, count, CACHE_TIMEOUT)
+        return count
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """
+    Постраничная пагинация с настраиваемым размером страницы.
+
+    Размер страницы передаётся параметром `page_size`
+    и ограничен значением `max_page_size`.
+
+    Если у представления есть `cache_namespace`, количество объектов
+    считается один раз на версию пространства имён и набор фильтров
+    и затем берётся из кэша для всех страниц выборки.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        namespace = getattr(view, 'cache_namespace', None)
+        count_key = None
+        if namespace:
+            count_key = get_count_key(namespace, request, (
+                self.page_query_param, self.page_size_query_param,
+                FIELDS_PARAM, OMIT_PARAM
+            ))
+        self.django_paginator_class = partial(
+            CachedCountPaginator, count_key=count_key
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Курсорная пагинация по составному ключу сортировки.
+
+    В отличие от CursorPagination из DRF курсор хранит значения всех
+    полей сортировки, а последнее из них (обычно `id`) уникально.
+    Поэтому смещение внутри одинаковых значений не нужно, и любая
+    страница выбирается одним диапазоном по индексу - глубокие
+    страницы стоят столько же, сколько первая.
+
+    Сортировка берётся из атрибута `cursor_ordering` представления.
+    Страница может состоять и из строк `.values()` с полями сортировки.
+    """
+
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, 'cursor_ordering', self.ordering))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = (
+            pagination._reverse_ordering(self.ordering)
+            if reverse else self.ordering
+        )
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_position_filter(
+                queryset.model, ordering, self.cursor.position
+            ))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = self.cursor is not None
+
+        if self.page:
+            self.previous_position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+            self.next_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        elif self.cursor is not None:
+            self.previous_position = self.next_position = self.cursor.position
+        else:
+            self.previous_position = self.next_position = None
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            pagination.Cursor(0, False, self.next_position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            pagination.Cursor(0, True, self.previous_position)
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            instance = SimpleNamespace(**instance)
+        return json.dumps([
+            self.model._meta.get_field(order.lstrip('-')).value_to_string(
+                instance
+            )
+            for order in ordering
+        ])
+
+    def get_position_filter(self, model, ordering, position):
+        """
+        Условие "строго после позиции" для составного ключа сортировки.
+
+        Для ключа (a, b) по убыванию a это `a < x OR (a = x AND b > y)`.
+        """
+
+        try:
+            values = json.loads(position)
+            if len(values) != len(ordering):
+                raise ValueError
+            values = [
+                model._meta.get_field(order.lstrip('-')).to_python(value)
+                for order, value in zip(ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = None
+        equal = {}
+        for order, value in zip(ordering, values):
+            field = order.lstrip('-')
+            lookup = 'lt' if order.startswith('-') else 'gt'
+            step = Q(**equal, **{f'{field}__{lookup}': value})
+            condition = step if condition is None else condition | step
+            equal[field] = value
+        return condition
+
+
+class PageOrCursorPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с курсорным режимом по выбору клиента.
+
+    Курсорный режим включается параметром `pagination=cursor`
+    (ссылки `next`/`previous` содержат параметр `cursor`, который
+    тоже его включает). Без них ответ остаётся постраничным
+    с полем `count`, поэтому существующие клиенты работают как раньше.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = KeysetPagination
+
+    def is_cursor_mode(self, request):
+        """Запрошен ли курсорный режим."""
+
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.is_cursor_mode(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            page = self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+            self.display_page_controls = (
+                self.cursor_paginator.display_page_controls
+            )
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
@@ -0,0 +1,35 @@
+from rest_framework import renderers
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSON-рендерер на orjson с откатом на стандартный рендерер DRF.
+
+    orjson сериализует ответ в несколько раз быстрее модуля json.
+    Если пакет не установлен, запрошен отступ (`indent`) или в
+    настройках DRF включено экранирование не-ASCII символов,
+    ответ формирует JSONRenderer из DRF.
+    """
+
+    encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not api_settings.UNICODE_JSON
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return orjson.dumps(
+            data, default=self.encoder.default, option=orjson.OPT_NON_STR_KEYS
+        )
@@ -1,17 +1,28 @@
 import re
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils.crypto import get_random_string
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from api.autocomplete import INDEXES, MAX_LIMIT
+from api.cache import bump_version
+from api.fieldsets import SparseFieldsMixin
 from reviews.constants import USERNAME_ME
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title)
 
 
 User = get_user_model()
 
+MAX_BATCH_SIZE = 100
+# Наибольшее значение AutoField: большие id не передаются в базу данных.
+MAX_ID = 2 ** 31 - 1
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(required=True, validators=[])
     email = serializers.EmailField(required=True, validators=[])
 
@@ -42,32 +53,61 @@ class UserSerializer(serializers.ModelSerializer):
             )
         return value
 
-    def create(self, validated_data):
-        user, created = User.objects.get_or_create(
-            email=validated_data['email'],
-            defaults=validated_data
-        )
-        if created:
-            confirmation_code = get_random_string(length=6)
-            user.confirmation_code = confirmation_code
-            user.save()
-        return user
+    existing_user = None
 
-    def validate(self, data):
-        email = data.get('email')
-        username = data.get('username')
-        existing_user = User.objects.filter(
-            email=email, username=username).first()
-        if existing_user:
-            return data
-        if User.objects.filter(email=email).exists():
+    def check_conflicts(self, email, username):
+        """
+        Проверка занятости email и username одним запросом.
+
+        Возвращает пользователя с этой же парой email и username
+        (повторная регистрация) или None, если оба значения свободны.
+        """
+
+        users = User.objects.filter(Q(email=email) | Q(username=username))
+        if self.instance is not None:
+            users = users.exclude(pk=self.instance.pk)
+        users = list(users[:2])
+        for user in users:
+            if user.email == email and user.username == username:
+                return user
+        if any(user.email == email for user in users):
             raise serializers.ValidationError(
                 'Адрес электронной почты уже существует.'
             )
-        if User.objects.filter(username=username).exists():
+        if users:
             raise serializers.ValidationError(
                 'Имя пользователя уже существует.'
             )
+        return None
+
+    def create(self, validated_data):
+        """
+        Создание пользователя с кодом подтверждения одним INSERT.
+
+        Пользователя, созданного параллельным запросом, отклоняют
+        ограничения уникальности email и username.
+        """
+
+        if self.existing_user is not None:
+            return self.existing_user
+        try:
+            with transaction.atomic():
+                return User.objects.create(
+                    **validated_data,
+                    confirmation_code=get_random_string(length=6)
+                )
+        except IntegrityError:
+            user = self.check_conflicts(
+                validated_data['email'], validated_data['username']
+            )
+            if user is None:
+                raise
+            return user
+
+    def validate(self, data):
+        self.existing_user = self.check_conflicts(
+            data.get('email'), data.get('username')
+        )
         return data
 
 
@@ -86,22 +126,58 @@ class TokenSerializer(serializers.Serializer):
         return data
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class AutocompleteSerializer(serializers.Serializer):
+    q = serializers.CharField(required=True, trim_whitespace=True)
+    type = serializers.ChoiceField(choices=list(INDEXES), required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_LIMIT, default=10
+    )
+
+
+class TitleBatchSerializer(serializers.Serializer):
+    ids = serializers.CharField(required=True)
+
+    def validate_ids(self, value):
+        """Список id через запятую без повторов, в исходном порядке."""
+
+        try:
+            ids = [int(pk) for pk in value.split(',')]
+        except ValueError:
+            raise serializers.ValidationError(
+                'Укажите id произведений через запятую.'
+            )
+        if not all(1 <= pk <= MAX_ID for pk in ids):
+            raise serializers.ValidationError(
+                f'id произведения должен быть от 1 до {MAX_ID}.'
+            )
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > MAX_BATCH_SIZE:
+            raise serializers.ValidationError(
+                f'Можно запросить не более {MAX_BATCH_SIZE} произведений.'
+            )
+        return ids
+
+
+class TitleExportSerializer(serializers.Serializer):
+    with_reviews = serializers.BooleanField(default=False)
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         exclude = ('id',)
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         exclude = ('id', )
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
-    rating = serializers.IntegerField(read_only=True, default=0)
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    rating = serializers.SerializerMethodField()
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(
         read_only=True,
@@ -109,9 +185,31 @@ class TitleReadSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'reviews_count', 'description',
+            'genre', 'category'
+        )
         model = Title
 
+    def get_rating(self, title):
+        """Средняя оценка произведения или None, если отзывов нет."""
+
+        if not title.reviews_count:
+            return None
+        return int(title.rating)
+
+
+class TitleDetailSerializer(TitleReadSerializer):
+    score_histogram = serializers.SerializerMethodField()
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('score_histogram',)
+
+    def get_score_histogram(self, title):
+        """Количество отзывов с каждой оценкой."""
+
+        return title.score_histogram
+
 
 class TitleChangeSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
@@ -140,11 +238,151 @@ class TitleChangeSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         """Переопределение вывода для использования TitleReadSerializer."""
 
-        read_serializer = TitleReadSerializer(instance)
+        read_serializer = TitleReadSerializer(instance, context=self.context)
         return read_serializer.data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBulkListSerializer(serializers.ListSerializer):
+    """
+    Массовое создание и изменение произведений.
+
+    Слаги категорий и жанров всех произведений разрешаются одним
+    запросом на модель, связи с жанрами записываются одной вставкой
+    в промежуточную таблицу. Ошибки возвращаются списком по позициям
+    произведений в запросе. Для изменения в `instance` передаётся
+    queryset произведений.
+
+    Массовые операции не отправляют сигналы моделей, поэтому версия
+    кэша произведений сбрасывается здесь же.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list) and len(data) > MAX_BATCH_SIZE:
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    f'Можно передать не более {MAX_BATCH_SIZE} произведений.'
+                ]
+            })
+        items = super().to_internal_value(data)
+        categories = Category.objects.in_bulk(
+            {item['category'] for item in items if 'category' in item},
+            field_name='slug'
+        )
+        genres = Genre.objects.in_bulk(
+            {slug for item in items for slug in item.get('genre', ())},
+            field_name='slug'
+        )
+        if self.instance is not None:
+            self.titles = self.instance.in_bulk(
+                [item['id'] for item in items if 'id' in item]
+            )
+        errors = [self.resolve(item, categories, genres) for item in items]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def resolve(self, item, categories, genres):
+        """Заменяет слаги объектами, возвращает ошибки произведения."""
+
+        errors = {}
+        if 'category' in item:
+            if item['category'] in categories:
+                item['category'] = categories[item['category']]
+            else:
+                errors['category'] = [
+                    f'Категории со слагом {item["category"]} не существует.'
+                ]
+        if 'genre' in item:
+            missing = [slug for slug in item['genre'] if slug not in genres]
+            if missing:
+                errors['genre'] = [
+                    f'Жанра со слагом {slug} не существует.'
+                    for slug in missing
+                ]
+            else:
+                item['genre'] = [
+                    genres[slug] for slug in dict.fromkeys(item['genre'])
+                ]
+        if self.instance is not None:
+            if 'id' not in item:
+                errors['id'] = ['Обязательное поле.']
+            elif item['id'] not in self.titles:
+                errors['id'] = [f'Произведения с id {item["id"]} нет.']
+        return errors
+
+    def create(self, validated_data):
+        titles = [
+            Title(**{
+                field: value for field, value in item.items()
+                if field != 'genre'
+            })
+            for item in validated_data
+        ]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Title.objects.bulk_create(titles)
+        else:
+            for title in titles:
+                title.save(force_insert=True)
+        self.set_genres({
+            title: item['genre']
+            for title, item in zip(titles, validated_data)
+        })
+        bump_version('titles', INDEXES['titles'].namespace)
+        return titles
+
+    def update(self, instance, validated_data):
+        titles = {}
+        fields = set()
+        genres = {}
+        for item in validated_data:
+            title = self.titles[item['id']]
+            for field, value in item.items():
+                if field == 'genre':
+                    genres[title] = value
+                elif field != 'id':
+                    setattr(title, field, value)
+                    fields.add(field)
+            titles[title.pk] = title
+        if fields:
+            Title.objects.bulk_update(titles.values(), fields)
+        GenreTitle.objects.filter(title__in=genres).delete()
+        self.set_genres(genres)
+        bump_version('titles')
+        if 'name' in fields:
+            bump_version(INDEXES['titles'].namespace)
+        return list(titles.values())
+
+    @staticmethod
+    def set_genres(genres):
+        """Одна вставка связей произведений с жанрами."""
+
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre)
+            for title, title_genres in genres.items()
+            for genre in title_genres
+        )
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    category = serializers.SlugField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+
+    class Meta:
+        model = Title
+        fields = ['name', 'year', 'genre', 'description', 'category']
+        list_serializer_class = TitleBulkListSerializer
+
+
+class TitleBulkUpdateSerializer(TitleBulkSerializer):
+    id = serializers.IntegerField()
+
+    class Meta(TitleBulkSerializer.Meta):
+        fields = ['id'] + TitleBulkSerializer.Meta.fields
+
+
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
@@ -152,28 +390,71 @@ class ReviewSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count'
+        )
         model = Review
 
-    def validate(self, data):
-        request = self.context.get('request')
-        if request and request.method == 'POST':
-            title_id = request.parser_context['kwargs']['title_id']
-            title = get_object_or_404(Title, pk=title_id)
-            if Review.objects.filter(
-                title=title,
-                author=request.user
+    def create(self, validated_data):
+        """
+        Создание отзыва с проверкой уникальности на уровне базы данных.
+
+        Повторный отзыв отклоняет ограничение
+        `unique_review_per_title_for_user`, поэтому отдельный запрос
+        на проверку не нужен, а параллельные запросы не создадут дубль.
+        """
+
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
             ).exists():
-                raise serializers.ValidationError(
-                    "На одно произведение пользователь может оставить "
-                    "только один отзыв."
-                )
-        return data
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'На одно произведение пользователь может оставить '
+                    'только один отзыв.'
+                ]
+            })
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source='author.username')
 
     class Meta:
         model = Comment
         fields = ['id', 'text', 'author', 'pub_date']
+
+
+class TitleReferenceSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name')
+
+
+class ReviewReferenceSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Review
+        fields = ('id', 'title')
+
+
+class UserReviewSerializer(ReviewSerializer):
+    """Отзыв в ленте пользователя со ссылкой на произведение."""
+
+    title = TitleReferenceSerializer(read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+
+
+class UserCommentSerializer(CommentSerializer):
+    """Комментарий в ленте пользователя со ссылкой на отзыв."""
+
+    review = ReviewReferenceSerializer(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ['review']
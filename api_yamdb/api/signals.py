@@ -0,0 +1,152 @@
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
+from django.dispatch import receiver
+
+from .authentication import REVOKED, set_token_version
+from .autocomplete import MODEL_INDEXES
+from .cache import (COMMENTS_NAMESPACE, REVIEWS_NAMESPACE, USERS_NAMESPACE,
+                    bump_version, get_version)
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.signals import get_deleting
+
+
+def get_comment_namespaces(comment):
+    """
+    Пространства имён комментариев отзыва и отзывов произведения,
+    чей счётчик комментариев изменился.
+
+    Произведение берётся из загруженного отзыва, а если отзыв
+    не загружен - одним запросом. Если отзыв удаляется вместе
+    с комментарием, оба пространства имён сбрасывает его удаление.
+    """
+
+    if comment.review_id in get_deleting(Review):
+        return ()
+    namespaces = (COMMENTS_NAMESPACE.format(review_id=comment.review_id),)
+    if Comment.review.is_cached(comment):
+        title_id = comment.review.title_id
+    else:
+        title_id = Review.objects.filter(pk=comment.review_id).values_list(
+            'title_id', flat=True
+        ).first()
+    if title_id is None:
+        return namespaces
+    return namespaces + (REVIEWS_NAMESPACE.format(title_id=title_id),)
+
+
+INVALIDATES = {
+    Title: lambda title: (
+        'titles', REVIEWS_NAMESPACE.format(title_id=title.pk)
+    ),
+    Category: lambda category: ('titles', 'categories'),
+    Genre: lambda genre: ('titles', 'genres'),
+    Review: lambda review: (
+        'titles',
+        REVIEWS_NAMESPACE.format(title_id=review.title_id),
+        COMMENTS_NAMESPACE.format(review_id=review.pk),
+    ),
+    Comment: get_comment_namespaces,
+}
+
+
+def invalidate_cache(sender, instance, **kwargs):
+    """Сбрасывает кэш ответов, зависящих от изменённой модели."""
+
+    bump_version(*INVALIDATES[sender](instance))
+
+
+# Обработчики подключаются только к перечисленным моделям: у остальных
+# нет лишних вызовов, и удаление может обойтись без выборки объектов.
+for model in INVALIDATES:
+    post_save.connect(invalidate_cache, sender=model)
+    post_delete.connect(invalidate_cache, sender=model)
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    """Запоминает имя пользователя, чтобы заметить его изменение."""
+
+    instance._loaded_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_usernames(sender, instance, signal, created=False, **kwargs):
+    """
+    Сбрасывает кэш отзывов и комментариев, показывающих имя автора,
+    при смене имени или удалении пользователя.
+
+    Регистрация и изменение остальных полей версию не меняют.
+    """
+
+    username = instance.__dict__.get('username')
+    previous = instance._loaded_username
+    instance._loaded_username = username
+    if signal is post_save and (created or username == previous):
+        return
+    bump_version(USERS_NAMESPACE)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    """Сбрасывает кэш произведений при изменении их жанров."""
+
+    if action.startswith('post_'):
+        bump_version('titles')
+
+
+def remember_autocomplete_values(sender, instance, **kwargs):
+    """Запоминает индексируемые поля, чтобы заметить их изменение."""
+
+    index = MODEL_INDEXES.get(sender)
+    if index:
+        instance._autocomplete_values = index.get_values(instance)
+
+
+def update_autocomplete(sender, instance, signal, created=False, **kwargs):
+    """
+    Обновляет индекс подсказок после фиксации изменения.
+
+    Версия индекса меняется только при создании, удалении объекта
+    или изменении индексируемых полей, поэтому остальные записи
+    не заставляют индексы других процессов перестраиваться.
+    """
+
+    index = MODEL_INDEXES.get(sender)
+    if not index:
+        return
+    item = None
+    if signal is post_save:
+        item = index.get_values(instance)
+        previous = getattr(instance, '_autocomplete_values', None)
+        instance._autocomplete_values = item
+        if not created and item == previous:
+            return
+    pk = instance.pk
+    version = get_version(index.namespace)
+    bump_version(index.namespace)
+    transaction.on_commit(lambda: index.update(pk, item, version))
+
+
+for model in MODEL_INDEXES:
+    post_init.connect(remember_autocomplete_values, sender=model)
+    post_save.connect(update_autocomplete, sender=model)
+    post_delete.connect(update_autocomplete, sender=model)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def update_token_version(sender, instance, signal, **kwargs):
+    """
+    Обновляет версию токенов пользователя в кэше после фиксации.
+
+    Запись, а не удаление ключа, не даёт параллельному запросу
+    вернуть в кэш версию, прочитанную до изменения.
+    """
+
+    version = instance.token_version
+    if signal is post_delete or not instance.is_active:
+        version = REVOKED
+    pk = instance.pk
+    transaction.on_commit(lambda: set_token_version(pk, version))
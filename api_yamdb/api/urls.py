@@ -2,6 +2,8 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.views import (
+    AutocompleteView,
+    CacheStatsView,
     CategoryViewSet,
     CommentViewSet,
     GenreViewSet,
@@ -9,6 +11,8 @@ from api.views import (
     SignupView,
     TitlesViewSet,
     TokenView,
+    UserCommentViewSet,
+    UserReviewViewSet,
     UserViewSet,
 )
 
@@ -16,6 +20,16 @@ app_name = 'api'
 
 router_v1 = DefaultRouter()
 router_v1.register('users', UserViewSet, basename='user')
+router_v1.register(
+    r'users/(?P<username>[\w.@+-]+)/reviews',
+    UserReviewViewSet,
+    basename='user-reviews'
+)
+router_v1.register(
+    r'users/(?P<username>[\w.@+-]+)/comments',
+    UserCommentViewSet,
+    basename='user-comments'
+)
 router_v1.register('titles', TitlesViewSet, basename='titles')
 router_v1.register('categories', CategoryViewSet, basename='categories')
 router_v1.register('genres', GenreViewSet, basename='genres')
@@ -38,6 +52,8 @@ auth_urls = [
 v1_urls = [
     path('', include(router_v1.urls)),
     path('auth/', include(auth_urls)),
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache_stats'),
 ]
 
 urlpatterns = [
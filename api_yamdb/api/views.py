@@ -1,27 +1,43 @@
-from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters import rest_framework
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.views import APIView
 
-from .filters import TitleFilter
-from .mixins import BasicActionsViewSet
+from .authentication import UserAccessToken
+from .autocomplete import INDEXES
+from .cache import (COMMENTS_NAMESPACE, REVIEWS_NAMESPACE, USERS_NAMESPACE,
+                    get_stats)
+from .export import iter_ndjson
+from .filters import DEFAULT_TITLE_ORDERING, TITLE_ORDERINGS, TitleFilter
+from .lean import (LeanCommentSerializer, LeanReviewSerializer,
+                   LeanTitleSerializer, LeanUserCommentSerializer,
+                   LeanUserReviewSerializer)
+from .mixins import (BasicActionsViewSet, CachedListMixin,
+                     ConditionalGetMixin, LeanListMixin,
+                     SparseFieldsQuerysetMixin)
+from .pagination import KeysetPagination, PageOrCursorPagination
 from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrReadOnly
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, ReviewSerializer,
-                          TitleChangeSerializer, TitleReadSerializer)
+from .serializers import (AutocompleteSerializer, CategorySerializer,
+                          CommentSerializer, GenreSerializer,
+                          ReviewSerializer, TitleBatchSerializer,
+                          TitleBulkSerializer, TitleBulkUpdateSerializer,
+                          TitleChangeSerializer, TitleDetailSerializer,
+                          TitleExportSerializer, TitleReadSerializer,
+                          UserCommentSerializer, UserReviewSerializer)
 from api.serializers import TokenSerializer, UserSerializer
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import (Category, Comment, Genre, OutboxEmail, Review,
+                            Title)
 
 User = get_user_model()
 
@@ -41,6 +57,8 @@ class UserViewSet(viewsets.ModelViewSet):
             permission_classes=[IsAuthenticated])
     def me(self, request):
         user = self.request.user
+        if user.get_deferred_fields():
+            user = User.objects.get(pk=user.pk)
         serializer = self.get_serializer(user)
         if self.request.method == 'PATCH':
             serializer = self.get_serializer(
@@ -52,21 +70,25 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 class SignupView(APIView):
-    """Регистрация пользователей."""
+    """
+    Регистрация пользователей.
+
+    Письмо с кодом подтверждения ставится в очередь и отправляется
+    командой `send_emails`.
+    """
 
     permission_classes = [AllowAny]
 
     def post(self, request):
         serializer = UserSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        send_mail(
-            'Код подтверждения',
-            f'Ваш код подтверждения: {user.confirmation_code}',
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
+        with transaction.atomic():
+            user = serializer.save()
+            OutboxEmail.objects.create(
+                to=user.email,
+                subject='Код подтверждения',
+                body=f'Ваш код подтверждения: {user.confirmation_code}',
+            )
         return Response({'email': user.email, 'username': user.username},
                         status=status.HTTP_200_OK)
 
@@ -80,82 +102,282 @@ class TokenView(APIView):
         serializer = TokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
-        token = AccessToken.for_user(user)
+        token = UserAccessToken.for_user(user)
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('-rating')
+class CacheStatsView(APIView):
+    """Статистика попаданий в кэш ответов."""
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+class AutocompleteView(APIView):
+    """Подсказки по началу слова для произведений, жанров и категорий."""
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        serializer = AutocompleteSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        kinds = [params['type']] if 'type' in params else INDEXES
+        return Response(
+            {
+                kind: INDEXES[kind].search(params['q'], params['limit'])
+                for kind in kinds
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class TitlesViewSet(
+    ConditionalGetMixin, CachedListMixin, SparseFieldsQuerysetMixin,
+    LeanListMixin, viewsets.ModelViewSet
+):
+    queryset = Title.objects.select_related('category').order_by(
+        '-rating', 'id'
+    )
+    sparse_prefetch = ('genre',)
+    sparse_defer = ('description',)
+    lean_serializer_class = LeanTitleSerializer
+    pagination_class = PageOrCursorPagination
+    cache_namespace = 'titles'
+    conditional_actions = ('list', 'retrieve', 'batch')
     filterset_class = TitleFilter
     filter_backends = [rest_framework.DjangoFilterBackend]
     permission_classes = [IsAdminOrReadOnly]
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
 
+    @property
+    def cursor_ordering(self):
+        """Ключ курсора - сортировка из параметра `ordering`."""
+
+        return TITLE_ORDERINGS.get(
+            self.request.query_params.get('ordering'),
+            TITLE_ORDERINGS[DEFAULT_TITLE_ORDERING]
+        )
+
+    def filter_queryset(self, queryset):
+        """
+        Поиск несовместим с курсорной пагинацией: ключ курсора
+        пересортировал бы результаты и потерял порядок по релевантности.
+        """
+
+        if (
+            self.request.query_params.get('search')
+            and self.paginator.is_cursor_mode(self.request)
+        ):
+            raise ValidationError({
+                'search': 'Поиск не поддерживает курсорную пагинацию, '
+                          'используйте постраничную.'
+            })
+        return super().filter_queryset(queryset)
+
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update', 'update']:
             return TitleChangeSerializer
+        if self.action == 'retrieve':
+            return TitleDetailSerializer
         return TitleReadSerializer
 
+    @action(detail=False)
+    def batch(self, request):
+        """Произведения по списку id в порядке запроса."""
+
+        serializer = TitleBatchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        titles = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response(serializer.data)
+
+    @action(detail=False, permission_classes=[IsAdmin])
+    def export(self, request):
+        """Весь каталог в формате NDJSON одним потоковым ответом."""
+
+        serializer = TitleExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        response = StreamingHttpResponse(
+            iter_ndjson(**serializer.validated_data),
+            content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="titles.ndjson"'
+        )
+        return response
+
+    @action(
+        methods=['post', 'patch'], detail=False, permission_classes=[IsAdmin]
+    )
+    def bulk(self, request):
+        """Массовое создание (POST) и изменение (PATCH) произведений."""
+
+        if request.method == 'PATCH':
+            serializer = TitleBulkUpdateSerializer(
+                Title.objects.all(), data=request.data,
+                many=True, partial=True
+            )
+            response_status = status.HTTP_200_OK
+        else:
+            serializer = TitleBulkSerializer(data=request.data, many=True)
+            response_status = status.HTTP_201_CREATED
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            ids = [title.pk for title in serializer.save()]
+        titles = self.get_queryset().in_bulk(ids)
+        return Response(
+            TitleReadSerializer(
+                [titles[pk] for pk in ids], many=True,
+                context=self.get_serializer_context()
+            ).data,
+            status=response_status
+        )
+
 
-class CategoryViewSet(BasicActionsViewSet):
+class CategoryViewSet(
+    ConditionalGetMixin, CachedListMixin, BasicActionsViewSet
+):
     """Получить список всех категорий."""
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_namespace = 'categories'
     filter_backends = (SearchFilter, )
     search_fields = ('name', )
     lookup_field = 'slug'
     permission_classes = [IsAdminOrReadOnly]
 
 
-class GenreViewSet(BasicActionsViewSet):
+class GenreViewSet(
+    ConditionalGetMixin, CachedListMixin, BasicActionsViewSet
+):
     """Получить список всех жанров."""
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_namespace = 'genres'
     filter_backends = (SearchFilter,)
     search_fields = ('name', )
     lookup_field = 'slug'
     permission_classes = [IsAdminOrReadOnly]
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ConditionalGetMixin, SparseFieldsQuerysetMixin, LeanListMixin,
+    viewsets.ModelViewSet
+):
     """Создание отзывов."""
 
+    queryset = Review.objects.select_related('author').order_by(
+        'pub_date', 'id'
+    )
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = ('pub_date', 'id')
     serializer_class = ReviewSerializer
+    sparse_defer = ('text',)
+    lean_serializer_class = LeanReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
     http_method_names = ['get', 'post', 'patch', 'delete', 'head']
 
-    def get_queryset(self):
-        title = self.get_title()
-        return Review.objects.filter(title=title)
+    def get_cache_namespaces(self):
+        return (
+            REVIEWS_NAMESPACE.format(title_id=self.kwargs.get('title_id')),
+            USERS_NAMESPACE,
+        )
+
+    @cached_property
+    def title(self):
+        """Произведение из адреса, загружается один раз за запрос."""
 
-    def get_title(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Title, pk=title_id)
+        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+
+    def get_queryset(self):
+        return super().get_queryset().filter(title=self.title)
 
     def perform_create(self, serializer):
-        title = self.get_title()
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin, SparseFieldsQuerysetMixin, LeanListMixin,
+    viewsets.ModelViewSet
+):
     """Создание комментариев."""
 
+    queryset = Comment.objects.select_related('author').order_by(
+        'pub_date', 'id'
+    )
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = ('pub_date', 'id')
     serializer_class = CommentSerializer
+    sparse_defer = ('text',)
+    lean_serializer_class = LeanCommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
     http_method_names = ['get', 'post', 'patch', 'delete']
 
-    def get_queryset(self):
-        review = self.get_review()
-        return review.comments.all()
+    def get_cache_namespaces(self):
+        return (
+            COMMENTS_NAMESPACE.format(review_id=self.kwargs.get('review_id')),
+            USERS_NAMESPACE,
+        )
 
-    def get_review(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        return get_object_or_404(Review, title_id=title_id, id=review_id)
+    @cached_property
+    def review(self):
+        """Отзыв из адреса, загружается один раз за запрос."""
+
+        return get_object_or_404(
+            Review,
+            title_id=self.kwargs.get('title_id'),
+            id=self.kwargs.get('review_id')
+        )
+
+    def get_queryset(self):
+        return super().get_queryset().filter(review=self.review)
 
     def perform_create(self, serializer):
-        review = self.get_review()
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
+
+
+class AuthorActivityViewSet(
+    LeanListMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Лента объектов пользователя из адреса, от новых к старым.
+
+    Страницы выбираются курсором по индексу (author, pub_date, id).
+    """
+
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-pub_date', '-id')
+    permission_classes = [AllowAny]
+
+    @cached_property
+    def author(self):
+        """Пользователь из адреса, загружается один раз за запрос."""
+
+        return get_object_or_404(User, username=self.kwargs.get('username'))
+
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.author)
+
+
+class UserReviewViewSet(AuthorActivityViewSet):
+    """Отзывы пользователя."""
+
+    queryset = Review.objects.select_related('author', 'title')
+    serializer_class = UserReviewSerializer
+    lean_serializer_class = LeanUserReviewSerializer
+
+
+class UserCommentViewSet(AuthorActivityViewSet):
+    """Комментарии пользователя."""
+
+    queryset = Comment.objects.select_related('author', 'review')
+    serializer_class = UserCommentSerializer
+    lean_serializer_class = LeanUserCommentSerializer
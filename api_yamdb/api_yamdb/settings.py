@@ -72,6 +72,20 @@ DATABASES = {
 }
 
 
+# Cache
+# Кэш ответов API версионируется через общий кэш, поэтому при нескольких
+# процессах нужен общий бэкенд (файловый, Redis, Memcached).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+API_CACHE_TIMEOUT = 300
+API_TOKEN_VERSION_TIMEOUT = 30
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -95,9 +109,13 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
 
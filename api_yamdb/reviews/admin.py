@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (Category, Comment, Genre, GenreTitle, OutboxEmail,
+                     Review, Title, User)
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -67,8 +68,14 @@ class ReviewAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    extra = 1
+
+
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
+    inlines = (GenreTitleInline,)
     list_display = (
         'name',
         'year',
@@ -82,4 +89,18 @@ class TitleAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
     def get_genres(self, obj):
-        return ', '.join(genre.name for genre in obj.genres.all())
+        return ', '.join(genre.name for genre in obj.genre.all())
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'to',
+        'subject',
+        'created_at',
+        'attempts',
+        'sent_at',
+    )
+    search_fields = ('to',)
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
@@ -1,6 +1,6 @@
 import csv
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, call_command
 
 from reviews.constants import DATA_PATH
 from reviews.models import Category, Comment, Genre, Review, Title, User
@@ -54,4 +54,6 @@ class Command(BaseCommand):
                 genre = Genre.objects.get(name=genre_name.strip())
                 title.genre.add(genre)
 
+        call_command('rebuild_title_ratings', stdout=self.stdout)
+        call_command('rebuild_comment_counts', stdout=self.stdout)
         self.stdout.write(self.style.SUCCESS('Все данные загружены'))
@@ -0,0 +1,70 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from api.cache import REVIEWS_NAMESPACE, bump_version
+from reviews.models import Comment, Review
+
+CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """
+    Команда для пересчёта счётчиков комментариев отзывов.
+
+    Обходит отзывы порциями по первичному ключу, как и
+    `rebuild_title_ratings`, и сбрасывает кэш отзывов произведений,
+    счётчики которых изменились.
+    """
+
+    help = 'Пересчитывает количество комментариев отзывов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество отзывов, обрабатываемых за один проход'
+        )
+
+    def handle(self, *args, **options):
+        """Пересчёт счётчиков по порциям отзывов."""
+
+        chunk_size = options['chunk_size']
+        last_pk = 0
+        fixed = 0
+        while True:
+            with transaction.atomic():
+                reviews = list(
+                    Review.objects.select_for_update()
+                    .filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .only('title_id', 'comments_count')
+                    [:chunk_size]
+                )
+                if not reviews:
+                    break
+                counts = dict(
+                    Comment.objects.filter(review__in=reviews)
+                    .values_list('review_id')
+                    .annotate(count=Count('id'))
+                    .order_by()
+                )
+                changed = []
+                for review in reviews:
+                    count = counts.get(review.pk, 0)
+                    if review.comments_count != count:
+                        review.comments_count = count
+                        changed.append(review)
+                Review.objects.bulk_update(changed, ['comments_count'])
+                if changed:
+                    bump_version(*{
+                        REVIEWS_NAMESPACE.format(title_id=review.title_id)
+                        for review in changed
+                    })
+                fixed += len(changed)
+            last_pk = reviews[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Счётчики пересчитаны, исправлено отзывов: {fixed}'
+        ))
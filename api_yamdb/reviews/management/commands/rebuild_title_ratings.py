@@ -0,0 +1,102 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from api.cache import bump_version
+from reviews.models import SCORES, Review, Title, score_count_field
+
+CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """
+    Команда для пересчёта агрегатов рейтинга и распределения оценок
+    произведений.
+
+    Обходит произведения порциями по первичному ключу, поэтому подходит
+    как для первичного заполнения существующей базы, так и для
+    исправления расхождений с таблицей отзывов.
+    """
+
+    help = 'Пересчитывает рейтинг произведений по их отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество произведений, обрабатываемых за один проход'
+        )
+
+    def handle(self, *args, **options):
+        """Пересчёт агрегатов рейтинга по порциям произведений."""
+
+        chunk_size = options['chunk_size']
+        fields = self.get_fields()
+        last_pk = 0
+        fixed = 0
+        while True:
+            with transaction.atomic():
+                titles = list(
+                    Title.objects.select_for_update()
+                    .filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .only(*fields)
+                    [:chunk_size]
+                )
+                if not titles:
+                    break
+                fixed += self.rebuild_chunk(titles, fields)
+            last_pk = titles[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан, исправлено произведений: {fixed}'
+        ))
+
+    @staticmethod
+    def get_fields():
+        """Поля произведения, которые пересчитывает команда."""
+
+        return ['rating_sum', 'reviews_count', 'rating'] + [
+            score_count_field(score) for score in SCORES
+        ]
+
+    @staticmethod
+    def rebuild_chunk(titles, fields):
+        """Пересчитывает агрегаты для порции произведений."""
+
+        histograms = {}
+        for row in (
+            Review.objects.filter(title__in=titles)
+            .values('title_id', 'score')
+            .annotate(count=Count('id'))
+            .order_by()
+        ):
+            histogram = histograms.setdefault(row['title_id'], {})
+            histogram[row['score']] = row['count']
+        changed = []
+        for title in titles:
+            histogram = histograms.get(title.pk, {})
+            rating_sum = sum(
+                score * count for score, count in histogram.items()
+            )
+            reviews_count = sum(histogram.values())
+            values = {
+                'rating_sum': rating_sum,
+                'reviews_count': reviews_count,
+                'rating': rating_sum / reviews_count if reviews_count else 0,
+            }
+            for score in SCORES:
+                values[score_count_field(score)] = histogram.get(score, 0)
+            if all(
+                getattr(title, field) == value
+                for field, value in values.items()
+            ):
+                continue
+            for field, value in values.items():
+                setattr(title, field, value)
+            changed.append(title)
+        Title.objects.bulk_update(changed, fields)
+        if changed:
+            bump_version('titles')
+        return len(changed)
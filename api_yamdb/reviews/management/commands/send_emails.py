@@ -0,0 +1,120 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+BACKOFF = 30
+MAX_BACKOFF = 3600
+LEASE = timedelta(minutes=10)
+
+
+class Command(BaseCommand):
+    """
+    Команда для отправки писем из очереди OutboxEmail.
+
+    Письма отправляются порциями через одно соединение с почтовым
+    сервером. Неудачная отправка повторяется с экспоненциально
+    растущей задержкой, пока не будет исчерпано число попыток.
+    """
+
+    help = 'Отправляет письма из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество писем, отправляемых за одно соединение'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=MAX_ATTEMPTS,
+            help='Количество попыток отправки письма'
+        )
+        parser.add_argument(
+            '--backoff',
+            type=int,
+            default=BACKOFF,
+            help='Задержка перед второй попыткой в секундах'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками очереди в секундах'
+        )
+
+    def get_delay(self, attempts, backoff):
+        """Задержка перед следующей попыткой: backoff, 2*backoff, ..."""
+
+        return timedelta(
+            seconds=min(backoff * 2 ** (attempts - 1), MAX_BACKOFF)
+        )
+
+    def send_batch(self, emails, backoff):
+        """Отправка порции писем, возвращает количество отправленных."""
+
+        sent = []
+        failed = {}
+        try:
+            with get_connection() as connection:
+                for email in emails:
+                    message = EmailMessage(
+                        email.subject, email.body,
+                        settings.DEFAULT_FROM_EMAIL, [email.to],
+                        connection=connection
+                    )
+                    try:
+                        message.send()
+                    except Exception as error:
+                        failed[email] = error
+                    else:
+                        sent.append(email.pk)
+        except Exception as error:
+            failed.update(
+                (email, error) for email in emails if email.pk not in sent
+            )
+
+        now = timezone.now()
+        OutboxEmail.objects.filter(pk__in=sent).update(sent_at=now)
+        for email, error in failed.items():
+            email.next_attempt_at = now + self.get_delay(
+                email.attempts, backoff
+            )
+            email.last_error = repr(error)
+        OutboxEmail.objects.bulk_update(
+            list(failed), ['next_attempt_at', 'last_error']
+        )
+        return len(sent)
+
+    def handle(self, *args, **options):
+        """Отправка порциями, пока в очереди есть письма к отправке."""
+
+        total = 0
+        while True:
+            emails = OutboxEmail.objects.claim(
+                options['batch_size'], options['max_attempts'], LEASE
+            )
+            if emails:
+                total += self.send_batch(emails, options['backoff'])
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {total}'
+        ))
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
 from . import constants, validators
 
@@ -8,6 +11,8 @@ from . import constants, validators
 class User(AbstractUser):
     """Модель пользователя."""
 
+    TOKEN_FIELDS = ('username', 'role', 'is_staff', 'is_active')
+
     confirmation_code = models.CharField(
         max_length=constants.MAX_CODE_LENGHT,
         blank=True, null=True
@@ -28,6 +33,10 @@ class User(AbstractUser):
         unique=True,
         validators=[validators.validate_username],
     )
+    token_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Версия токенов'
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -37,6 +46,28 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет пользователя и отзывает выданные токены,
+        если изменилось одно из полей TOKEN_FIELDS.
+        """
+
+        loaded = [
+            field for field in self.TOKEN_FIELDS
+            if field not in self.get_deferred_fields()
+        ]
+        previous = None
+        if not self._state.adding and loaded:
+            previous = User.objects.filter(pk=self.pk).values(*loaded).first()
+        if previous and any(
+            previous[field] != getattr(self, field) for field in loaded
+        ):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+
     @property
     def is_admin(self):
         return self.role == constants.ADMIN or self.is_staff
@@ -82,6 +113,43 @@ class Category(NamedSlugModel):
         verbose_name_plural = 'Категории'
 
 
+SCORES = range(
+    constants.MIN_VALUE_VALIDATOR, constants.MAX_VALUE_VALIDATOR + 1
+)
+
+
+def score_count_field(score):
+    """Имя поля произведения с количеством оценок score."""
+
+    return f'score_{score}_count'
+
+
+class TitleManager(models.Manager):
+    """Менеджер произведений с поддержкой агрегатов рейтинга."""
+
+    def shift_score(self, title_id, score, count=1):
+        """
+        Учитывает оценку в рейтинге и распределении оценок произведения
+        (count=1) или исключает её оттуда (count=-1).
+
+        Агрегаты меняются одним UPDATE через F-выражения,
+        поэтому параллельные отзывы не теряют изменений.
+        """
+
+        rating_sum = F('rating_sum') + score * count
+        reviews_count = F('reviews_count') + count
+        score_field = score_count_field(score)
+        return self.filter(pk=title_id).update(
+            **{score_field: F(score_field) + count},
+            rating_sum=rating_sum,
+            reviews_count=reviews_count,
+            rating=Coalesce(
+                Cast(rating_sum, FloatField()) / NullIf(reviews_count, 0),
+                Value(0.0)
+            )
+        )
+
+
 class Title(models.Model):
     """Модель для Произведений."""
 
@@ -97,6 +165,7 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         'Genre',
+        through='GenreTitle',
         related_name='titles',
         verbose_name='Жанр',
         help_text='Выберите жанры для произведения'
@@ -115,14 +184,102 @@ class Title(models.Model):
         verbose_name='Категория',
         help_text='Выберите категорию для произведения'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов'
+    )
+    rating = models.FloatField(
+        default=0,
+        editable=False,
+        verbose_name='Рейтинг',
+        help_text='Средняя оценка, 0 - если отзывов нет'
+    )
+
+    objects = TitleManager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(
+                fields=['-rating', 'id'],
+                name='title_rating_id_idx'
+            ),
+            models.Index(
+                fields=['category', 'year'],
+                name='title_category_year_idx'
+            ),
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(
+                fields=['-reviews_count', 'id'],
+                name='title_reviews_count_id_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def score_histogram(self):
+        """Количество отзывов с каждой оценкой."""
+
+        return {
+            score: getattr(self, score_count_field(score)) for score in SCORES
+        }
+
+
+for score in SCORES:
+    Title.add_to_class(score_count_field(score), models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=f'Количество оценок {score}'
+    ))
+
+
+class GenreTitle(models.Model):
+    """
+    Связь произведений с жанрами.
+
+    Уникальный индекс (title, genre) обслуживает выборку жанров
+    произведения, индекс (genre, title) - выборку произведений жанра.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Произведение'
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Жанр'
+    )
+
+    class Meta:
+        db_table = 'reviews_title_genre'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_genre_per_title'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['genre', 'title'], name='genre_title_idx'),
+        ]
+        verbose_name = 'Жанр произведения'
+        verbose_name_plural = 'Жанры произведений'
+
+    def __str__(self):
+        return f'{self.title} - {self.genre}'
+
 
 class TextModel(models.Model):
     """Абстрактная модель для объектов с текстом и автором."""
@@ -148,6 +305,19 @@ class TextModel(models.Model):
         return self.text[:constants.MAX_NAME_LENGHT]
 
 
+class ReviewManager(models.Manager):
+
+    def shift_comments(self, review_id, count=1):
+        """
+        Учитывает комментарий в счётчике отзыва (count=1)
+        или исключает его оттуда (count=-1) одним UPDATE.
+        """
+
+        return self.filter(pk=review_id).update(
+            comments_count=F('comments_count') + count
+        )
+
+
 class Review(TextModel):
     """Модель для отзывов."""
 
@@ -170,6 +340,13 @@ class Review(TextModel):
                 max_value=constants.MAX_VALUE_VALIDATOR)
         )
     )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+
+    objects = ReviewManager()
 
     class Meta(TextModel.Meta):
         constraints = [
@@ -178,9 +355,35 @@ class Review(TextModel):
                 name='unique_review_per_title_for_user'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date', 'id'],
+                name='review_author_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и пересчитывает рейтинг произведения."""
+
+        with transaction.atomic():
+            previous = None
+            if self.pk is not None:
+                previous = Review.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('title_id', 'score').first()
+            super().save(*args, **kwargs)
+            if previous == (self.title_id, self.score):
+                return
+            if previous:
+                Title.objects.shift_score(*previous, count=-1)
+            Title.objects.shift_score(self.title_id, self.score)
+
     def __str__(self):
         return (
             f'Привет, {self.author}!\n'
@@ -199,5 +402,102 @@ class Comment(TextModel):
     )
 
     class Meta(TextModel.Meta):
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date', 'id'],
+                name='comment_author_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+
+    def save(self, *args, **kwargs):
+        """Сохраняет комментарий и учитывает его в счётчике отзыва."""
+
+        with transaction.atomic():
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+            if adding:
+                Review.objects.shift_comments(self.review_id)
+
+
+class OutboxEmailManager(models.Manager):
+
+    def pending(self, max_attempts):
+        """Неотправленные письма, для которых не исчерпаны попытки."""
+
+        return self.filter(sent_at__isnull=True, attempts__lt=max_attempts)
+
+    def claim(self, batch_size, max_attempts, lease):
+        """
+        Забирает порцию писем, срок отправки которых наступил.
+
+        Письма откладываются на lease, поэтому параллельный обработчик
+        не возьмёт их повторно, пока идёт отправка, а письма
+        упавшего обработчика будут отправлены после истечения lease.
+        """
+
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                self.pending(max_attempts)
+                .select_for_update(skip_locked=True)
+                .filter(next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'id')
+                [:batch_size]
+            )
+            self.filter(pk__in=[email.pk for email in emails]).update(
+                attempts=F('attempts') + 1, next_attempt_at=now + lease
+            )
+        for email in emails:
+            email.attempts += 1
+        return emails
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку командой `send_emails`."""
+
+    to = models.EmailField(verbose_name='Получатель')
+    subject = models.CharField(
+        max_length=constants.MAX_FIELD_LENGTH,
+        verbose_name='Тема'
+    )
+    body = models.TextField(verbose_name='Текст')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Количество попыток'
+    )
+    sent_at = models.DateTimeField(
+        blank=True, null=True,
+        verbose_name='Дата отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    objects = OutboxEmailManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                name='outbox_email_pending_idx',
+                condition=Q(sent_at__isnull=True)
+            ),
+        ]
+        ordering = ('id',)
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+
+    def __str__(self):
+        return f'{self.subject} для {self.to}'
@@ -0,0 +1,129 @@
+"""
+Полнотекстовый поиск по произведениям.
+
+На SQLite используется внешний индекс FTS5, который синхронизируется
+с таблицей произведений триггерами. На PostgreSQL - GIN-индекс по
+выражению `to_tsvector`, отдельная синхронизация не нужна.
+На остальных СУБД поиск сводится к частичному совпадению.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from .models import Title
+
+MAX_TERMS = 8
+
+TITLE_TABLE = Title._meta.db_table
+FTS_TABLE = f'{TITLE_TABLE}_fts'
+PG_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({table}.name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({table}.description, '')), 'D')"
+).format(table=TITLE_TABLE)
+
+SQLITE_SETUP = (
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description,
+        content='{TITLE_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0)')",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+POSTGRESQL_SETUP = (
+    f'CREATE INDEX IF NOT EXISTS {TITLE_TABLE}_search_idx '
+    f'ON {TITLE_TABLE} USING GIN ({PG_VECTOR})',
+)
+
+
+def setup(using='default'):
+    """Создаёт поисковый индекс, если его ещё нет."""
+
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            if FTS_TABLE in connection.introspection.table_names(cursor):
+                return
+            statements = SQLITE_SETUP
+        elif connection.vendor == 'postgresql':
+            statements = POSTGRESQL_SETUP
+        else:
+            return
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def get_terms(query):
+    """Слова поискового запроса без служебных символов."""
+
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def search_titles(queryset, query):
+    """
+    Фильтрует произведения по поисковому запросу.
+
+    Каждое слово запроса ищется как префикс, результат содержит
+    аннотацию `search_rank` (больше - релевантнее) и упорядочен по ней.
+    Совпадение в названии весит больше, чем в описании.
+    """
+
+    terms = get_terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        queryset = queryset.extra(
+            select={'search_rank': f'-{FTS_TABLE}.rank'},
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = {TITLE_TABLE}.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[' AND '.join(f'"{term}"*' for term in terms)],
+        )
+    elif vendor == 'postgresql':
+        ts_query = ' & '.join(f'{term}:*' for term in terms)
+        queryset = queryset.extra(
+            select={
+                'search_rank': f"ts_rank({PG_VECTOR}, "
+                               "to_tsquery('simple', %s))"
+            },
+            select_params=[ts_query],
+            where=[f"{PG_VECTOR} @@ to_tsquery('simple', %s)"],
+            params=[ts_query],
+        )
+    else:
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset.filter(condition)
+    return queryset.order_by('-search_rank', 'id')
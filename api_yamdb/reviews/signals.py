@@ -0,0 +1,68 @@
+import threading
+
+from django.db.models.signals import post_delete, post_migrate, pre_delete
+from django.dispatch import receiver
+
+from . import search
+from .models import Comment, Review, Title
+
+
+_deleting = threading.local()
+
+
+def get_deleting(model):
+    """
+    Первичные ключи объектов model, удаляемых в этом потоке.
+
+    Каскадное удаление отправляет pre_delete всем объектам до удаления
+    первого из них, поэтому зависимые объекты могут не обновлять
+    счётчики и кэш родителя, который удаляется вместе с ними.
+    """
+
+    if not hasattr(_deleting, 'pks'):
+        _deleting.pks = {}
+    return _deleting.pks.setdefault(model, set())
+
+
+@receiver(pre_delete, sender=Title)
+@receiver(pre_delete, sender=Review)
+def remember_deleting(sender, instance, **kwargs):
+    get_deleting(sender).add(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def exclude_review_score(sender, instance, **kwargs):
+    """
+    Исключает оценку удалённого отзыва из рейтинга произведения.
+
+    Срабатывает и при каскадном удалении отзывов вместе
+    с пользователем; если удаляется и само произведение,
+    рейтинг не пересчитывается.
+    """
+
+    if instance.title_id not in get_deleting(Title):
+        Title.objects.shift_score(
+            instance.title_id, instance.score, count=-1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def exclude_comment(sender, instance, **kwargs):
+    """Исключает удалённый комментарий из счётчика отзыва."""
+
+    if instance.review_id not in get_deleting(Review):
+        Review.objects.shift_comments(instance.review_id, count=-1)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+def forget_deleting(sender, instance, **kwargs):
+    get_deleting(sender).discard(instance.pk)
+
+
+@receiver(post_migrate)
+def setup_full_text_search(sender, using, **kwargs):
+    """Создаёт поисковый индекс произведений после миграций."""
+
+    if sender.name == 'reviews':
+        search.setup(using)
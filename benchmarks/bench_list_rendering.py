@@ -0,0 +1,68 @@
+"""
+Сравнение формирования списков через сериализаторы DRF и JSONRenderer
+с быстрой сериализацией из строк `.values()` и FastJSONRenderer.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_list_rendering --rows 1000 10000
+"""
+import argparse
+
+from benchmarks.utils import report, seed_catalog, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--number', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    rows = max(args.rows)
+    seed_catalog(titles=rows, reviews=1)
+
+    from rest_framework.renderers import JSONRenderer
+
+    from api.lean import LeanReviewSerializer, LeanTitleSerializer
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import ReviewSerializer, TitleReadSerializer
+    from reviews.models import Review, Title
+
+    if orjson is None:
+        print('orjson не установлен, FastJSONRenderer использует json')
+
+    titles = Title.objects.order_by('-rating', 'id')
+    reviews = Review.objects.order_by('pub_date')
+
+    def drf(serializer_class, queryset, related):
+        def run():
+            data = serializer_class(
+                queryset.select_related(related)[:size], many=True
+            ).data
+            JSONRenderer().render(data)
+        return run
+
+    def lean(serializer_class, queryset):
+        def run():
+            serializer = serializer_class()
+            data = serializer.to_representation(
+                serializer.get_queryset(queryset)[:size]
+            )
+            FastJSONRenderer().render(data)
+        return run
+
+    for size in args.rows:
+        print(f'\nСтраница из {size} строк')
+        report({
+            'произведения, DRF': drf(
+                TitleReadSerializer, titles.prefetch_related('genre'),
+                'category'
+            ),
+            'произведения, values + orjson': lean(LeanTitleSerializer, titles),
+            'отзывы, DRF': drf(ReviewSerializer, reviews, 'author'),
+            'отзывы, values + orjson': lean(LeanReviewSerializer, reviews),
+        }, number=args.number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Сравнение фильтрации произведений по нескольким жанрам с прежней
+фильтрацией по одному слагу через соединение таблиц.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_title_filters --titles 20000
+"""
+import argparse
+
+from benchmarks.utils import report, seed_catalog, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    seed_catalog(titles=args.titles)
+
+    from api.filters import TitleFilter
+    from api.views import TitlesViewSet
+    from reviews.models import Title
+
+    ordered = Title.objects.order_by('-rating', 'id')
+
+    def page(queryset):
+        def run():
+            list(queryset[:10])
+            queryset.count()
+        return run
+
+    def filtered(params):
+        return page(TitleFilter(params, queryset=TitlesViewSet.queryset).qs)
+
+    report({
+        'join, один жанр (прежний путь)': page(
+            ordered.filter(genre__slug='genre-3')
+        ),
+        'подзапрос, один жанр': filtered({'genre': 'genre-3'}),
+        'join, два жанра через OR + distinct': page(
+            ordered.filter(genre__slug__in=['genre-3', 'genre-4']).distinct()
+        ),
+        'подзапрос, два жанра (any)': filtered({'genre': 'genre-3,genre-4'}),
+        'join, два жанра цепочкой (AND)': page(
+            ordered.filter(genre__slug='genre-3').filter(
+                genre__slug='genre-10'
+            )
+        ),
+        'подзапрос с HAVING, два жанра (all)': filtered(
+            {'genre': 'genre-3,genre-10', 'genre_match': 'all'}
+        ),
+    }, number=args.number)
+
+
+if __name__ == '__main__':
+    main()
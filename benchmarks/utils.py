@@ -0,0 +1,92 @@
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, 'api_yamdb')
+
+
+def setup_django():
+    """Настраивает проект на базе SQLite в памяти и создаёт таблицы."""
+
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = ':memory:'
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command('migrate', run_syncdb=True, verbosity=0)
+
+
+def seed_catalog(titles=10000, genres=20, categories=10, reviews=0):
+    """Заполняет базу произведениями, жанрами и, по желанию, отзывами."""
+
+    from django.core.management import call_command
+
+    from reviews.models import (Category, Genre, GenreTitle, Review, Title,
+                                User)
+
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(categories)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(genres)
+    )
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {idx}',
+            year=1900 + idx % 120,
+            description='Описание произведения. ' * 20,
+            category_id=category_ids[idx % categories],
+        )
+        for idx in range(titles)
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    GenreTitle.objects.bulk_create(
+        GenreTitle(
+            title_id=title_id, genre_id=genre_ids[(title_id + shift) % genres]
+        )
+        for title_id in title_ids
+        for shift in (0, 7)
+    )
+    if reviews:
+        User.objects.bulk_create(
+            User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+            for idx in range(reviews)
+        )
+        user_ids = list(User.objects.values_list('id', flat=True))
+        Review.objects.bulk_create(
+            Review(
+                title_id=title_id,
+                author_id=user_id,
+                text='Текст отзыва. ' * 20,
+                score=(title_id + user_id) % 10 + 1,
+            )
+            for title_id in title_ids
+            for user_id in user_ids
+        )
+    with open(os.devnull, 'w') as devnull:
+        call_command('rebuild_title_ratings', stdout=devnull)
+
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def report(cases, number=20):
+    """Печатает среднее время выполнения каждого сценария."""
+
+    width = max(map(len, cases))
+    for name, case in cases.items():
+        elapsed = min(timeit.repeat(case, number=number, repeat=3)) / number
+        print(f'{name:<{width}}  {elapsed * 1000:8.3f} мс')
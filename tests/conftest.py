@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,28 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    """
+    Тестовая база SQLite в файле, а не в памяти.
+
+    В общей базе в памяти параллельные транзакции сразу получают ошибку
+    блокировки таблицы, а файловая база дожидается её освобождения,
+    как и рабочая.
+    """
+
+    from django.conf import settings
+
+    settings.DATABASES['default']['TEST']['NAME'] = str(
+        tmp_path_factory.mktemp('db') / 'test.sqlite3'
+    )
@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, client, admin_client,
+                                       user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) is None, (
+            'Если у произведения нет отзывов - значением поля `rating` '
+            'должно быть `None`.'
+        )
+
+        review = create_single_review(user_client, title_id, 'Текст', 10)
+        create_single_review(moderator_client, title_id, 'Текст', 5)
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            ),
+            data={'score': 1}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 3, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_rating_after_author_deleted(self, client, admin_client,
+                                            user_client, user,
+                                            moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Текст', 2)
+        create_single_review(moderator_client, title_id, 'Текст', 8)
+
+        user.delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count) == (8, 1), (
+            'Проверьте, что при каскадном удалении отзывов вместе с автором '
+            'их оценки исключаются из рейтинга произведения.'
+        )
+        assert self.get_rating(client, title_id) == 8
+
+    def test_03_rebuild_command(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 6)
+        Title.objects.update(rating_sum=0, reviews_count=0, rating=0)
+
+        call_command('rebuild_title_ratings', chunk_size=1)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.reviews_count, title.rating) == (
+            6, 1, 6
+        ), (
+            'Проверьте, что команда `rebuild_title_ratings` восстанавливает '
+            'агрегаты рейтинга по отзывам.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_04_rebuild_command_changes_etag(self, client, admin_client,
+                                             user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Текст', 6)
+        Title.objects.update(rating_sum=0, reviews_count=0, rating=0)
+        url = f'/api/v1/titles/{title_id}/'
+        etag = client.get(url)['ETag']
+
+        call_command('rebuild_title_ratings')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что команда `rebuild_title_ratings` сбрасывает '
+            'кэш произведений, если исправила рейтинг.'
+        )
+        assert response.json()['rating'] == 6
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import count_queries, create_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_list_query_count_is_constant(self, client):
+        create_catalog(30)
+        small_page, data = count_queries(
+            client, f'{self.TITLES_URL}?page_size=2'
+        )
+        assert len(data['results']) == 2
+        cache.clear()
+        large_page, data = count_queries(
+            client, f'{self.TITLES_URL}?page_size=30'
+        )
+        assert len(data['results']) == 30
+        assert small_page == large_page, (
+            f'Проверьте, что количество запросов к базе данных при GET-запросе '
+            f'к `{self.TITLES_URL}` не зависит от размера страницы: '
+            f'{small_page} запросов для 2 произведений и {large_page} для 30.'
+        )
+        assert large_page <= 3
+
+    def test_02_detail_query_count(self, client):
+        create_catalog(1)
+        title = Title.objects.get()
+        queries, data = count_queries(
+            client, self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert len(data['genre']) == 2
+        assert queries <= 2, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` загружает категорию и жанры '
+            'произведения без дополнительных запросов.'
+        )
+
+    def test_03_change_representation_query_count(self, admin_client):
+        category, genres = create_catalog(0)
+        data = {
+            'name': 'Новое произведение',
+            'year': 2001,
+            'genre': [genre.slug for genre in genres],
+            'category': category.slug,
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        queries = [query['sql'] for query in context.captured_queries]
+        last_insert = max(
+            idx for idx, sql in enumerate(queries) if sql.startswith('INSERT')
+        )
+        representation = len(queries) - last_insert - 1
+
+        response = admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(
+                title_id=response.json()['id']
+            ),
+            data={'genre': [genres[0].slug]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genre'] == [
+            {'name': genres[0].name, 'slug': genres[0].slug}
+        ]
+        assert representation <= 1, (
+            f'Проверьте, что ответ на POST-запрос к `{self.TITLES_URL}` '
+            'формируется без повторной загрузки категории, сейчас выполняется '
+            f'{representation} запросов после сохранения произведения.'
+        )
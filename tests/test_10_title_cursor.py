@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_rated_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleCursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def walk(self, client, url, direction):
+        seen = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                f'Проверьте, что в курсорном режиме `{self.TITLES_URL}` '
+                'не считает общее количество произведений.'
+            )
+            ids = [title['id'] for title in data['results']]
+            seen.extend(ids if direction == 'next' else reversed(ids))
+            url = data[direction]
+        return seen
+
+    def test_01_cursor_matches_page_order(self, client):
+        create_rated_titles(23)
+        response = client.get(f'{self.TITLES_URL}?page_size=100')
+        expected = [title['id'] for title in response.json()['results']]
+        assert len(expected) == 23
+
+        forward = self.walk(
+            client, f'{self.TITLES_URL}?pagination=cursor&page_size=4', 'next'
+        )
+        assert forward == expected, (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает произведения в порядке рейтинга без пропусков и '
+            'повторов.'
+        )
+
+    def test_02_cursor_previous_link(self, client):
+        create_rated_titles(11)
+        response = client.get(f'{self.TITLES_URL}?page_size=100')
+        expected = [title['id'] for title in response.json()['results']]
+
+        url = f'{self.TITLES_URL}?pagination=cursor&page_size=3'
+        while True:
+            data = client.get(url).json()
+            if not data['next']:
+                break
+            url = data['next']
+        assert data['previous']
+        backward = self.walk(client, data['previous'], 'previous')
+        last_page = [title['id'] for title in data['results']]
+        assert list(reversed(backward)) + last_page == expected
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_page_number_still_default(self, client):
+        create_rated_titles(3)
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 3
+
+    def test_05_empty_result(self, client):
+        for url in (
+            f'{self.TITLES_URL}?pagination=cursor',
+            f'{self.TITLES_URL}?pagination=cursor&name=Несуществующее',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что пустой результат курсорной пагинации '
+                f'`{self.TITLES_URL}` не приводит к ошибке.'
+            )
+            data = response.json()
+            assert data['results'] == []
+            assert data['next'] is None and data['previous'] is None
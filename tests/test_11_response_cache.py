@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import get_stats
+from api.signals import INVALIDATES, invalidate_cache
+from reviews.models import GenreTitle, OutboxEmail
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), len(context.captured_queries)
+
+    def test_01_repeated_list_is_cached(self, client, admin_client):
+        create_titles(admin_client)
+        for url in (self.TITLES_URL, self.GENRES_URL, self.CATEGORIES_URL):
+            first, _ = self.get(client, url)
+            second, queries = self.get(client, url)
+            assert second == first
+            assert queries == 0, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'обслуживается из кэша без запросов к базе данных.'
+            )
+        stats = get_stats()
+        assert stats['titles'] == {'hits': 1, 'misses': 1}
+
+    def test_02_parameters_are_part_of_key(self, client, admin_client):
+        titles, categories, _ = create_titles(admin_client)
+        all_titles, _ = self.get(client, self.TITLES_URL)
+        filtered, _ = self.get(
+            client, f'{self.TITLES_URL}?category={categories[0]["slug"]}'
+        )
+        assert all_titles['count'] == len(titles)
+        assert filtered['count'] == 1
+
+    def test_03_writes_invalidate(self, client, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        self.get(client, self.TITLES_URL)
+        self.get(client, self.GENRES_URL)
+
+        create_single_review(user_client, titles[1]['id'], 'Текст', 9)
+        data, _ = self.get(client, self.TITLES_URL)
+        rating = {title['id']: title['rating'] for title in data['results']}
+        assert rating[titles[1]['id']] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кэш списка произведений.'
+        )
+
+        response = admin_client.delete(
+            f'{self.GENRES_URL}{genres[0]["slug"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        data, _ = self.get(client, self.GENRES_URL)
+        assert data['count'] == len(genres) - 1
+        data, _ = self.get(client, self.TITLES_URL)
+        title = next(
+            title for title in data['results']
+            if title['id'] == titles[0]['id']
+        )
+        assert genres[0] not in title['genre'], (
+            'Проверьте, что удаление жанра сбрасывает кэш списка '
+            'произведений.'
+        )
+
+    def test_04_stats_admin_only(self, client, user_client, admin_client):
+        url = '/api/v1/cache/stats/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {'titles', 'categories', 'genres'}
+
+    def test_05_receivers_only_for_cached_models(self):
+        for signal in (post_save, post_delete):
+            for model in INVALIDATES:
+                assert invalidate_cache in signal._live_receivers(model)
+            for model in (GenreTitle, OutboxEmail):
+                assert invalidate_cache not in signal._live_receivers(
+                    model
+                ), (
+                    'Проверьте, что сброс кэша подключён только к моделям, '
+                    f'от которых зависят ответы, а не к {model.__name__}.'
+                )
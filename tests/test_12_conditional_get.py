@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_comments, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def assert_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert response.has_header('Last-Modified')
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным заголовком '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        assert len(context.captured_queries) == 0, (
+            f'Проверьте, что ответ 304 на GET-запрос к `{url}` формируется '
+            'без запросов к базе данных.'
+        )
+        return etag
+
+    def test_01_read_endpoints_support_etag(self, client, admin_client,
+                                            admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        urls = (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            '/api/v1/genres/',
+            '/api/v1/categories/',
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ) + f'{comments[0]["id"]}/',
+        )
+        for url in urls:
+            self.assert_not_modified(client, url)
+
+    def test_02_write_changes_etag(self, client, admin_client, admin,
+                                   user_client, user, moderator_client):
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = self.assert_not_modified(client, url)
+        other_url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        other_etag = self.assert_not_modified(client, other_url)
+
+        create_single_review(moderator_client, titles[0]['id'], 'Текст', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после создания отзыва GET-запрос к `{url}` '
+            'со старым ETag возвращает новые данные.'
+        )
+        assert len(response.json()['results']) == 3
+        response = client.get(other_url, HTTP_IF_NONE_MATCH=other_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = client.get(self.TITLES_URL)
+        etag = response['ETag']
+        create_single_review(moderator_client, titles[1]['id'], 'Текст', 3)
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_user_changes(self, client, admin_client, user_client,
+                             user, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 3)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = self.assert_not_modified(client, url)
+
+        django_user_model.objects.create_user(
+            username='newcomer', email='newcomer@yamdb.fake'
+        )
+        user.bio = 'Новое описание'
+        user.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что регистрация пользователя и изменение полей, '
+            f'которых нет в ответе, не меняют ETag `{url}`.'
+        )
+
+        user.username = 'renamed'
+        user.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена имени автора меняет ETag '
+            f'`{url}`.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
+
+    def test_04_deleted_parent(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = self.assert_not_modified(client, url)
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления произведения без отзывов '
+            f'GET-запрос к `{url}` со старым ETag возвращает 404.'
+        )
+
+        review = create_single_review(
+            user_client, titles[1]['id'], 'Текст', 3
+        ).json()
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=review['id']
+        )
+        etag = self.assert_not_modified(client, url)
+        admin_client.delete(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+            + f'{review["id"]}/'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления отзыва без комментариев '
+            f'GET-запрос к `{url}` со старым ETag возвращает 404.'
+        )
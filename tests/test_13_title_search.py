@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_prefix_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'терм') == [titles[0]['id']], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'находит произведения по началу слова из названия.'
+        )
+        assert self.search(client, 'yippie') == [titles[1]['id']], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет и по описанию произведения.'
+        )
+        assert self.search(client, 'КРЕПКИЙ ореш') == [titles[1]['id']]
+        assert self.search(client, 'крепкий терминатор') == []
+        assert self.search(client, '"*)') == []
+
+    def test_02_ranking(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Гранит науки',
+            'year': 2001,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'Крепкий орешек знаний тверд, но все же...'
+        }
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.search(client, 'орешек') == [
+            titles[1]['id'], response.json()['id']
+        ], (
+            'Проверьте, что совпадение в названии произведения '
+            'ранжируется выше совпадения в описании.'
+        )
+
+    def test_03_index_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = admin_client.patch(url, data={'name': 'Чужой'})
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'терминатор') == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'названия произведения.'
+        )
+        assert self.search(client, 'чужой') == [titles[0]['id']]
+
+        response = admin_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.search(client, 'чужой') == []
+
+    @pytest.mark.parametrize('params', [
+        {'pagination': 'cursor'}, {'cursor': 'cD0x'}
+    ])
+    def test_04_search_rejects_cursor(self, client, admin_client, params):
+        create_titles(admin_client)
+        response = client.get(
+            self.TITLES_URL, {'search': 'терм', **params}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что поиск с курсорной пагинацией отклоняется: '
+            'курсор не сохраняет порядок по релевантности.'
+        )
+        assert 'search' in response.json()
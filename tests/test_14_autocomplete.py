@@ -0,0 +1,131 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_delete, post_init, post_save
+from django.test.utils import CaptureQueriesContext
+
+from api.autocomplete import INDEXES, MODEL_INDEXES
+from api.signals import remember_autocomplete_values, update_autocomplete
+from reviews.models import GenreTitle, OutboxEmail, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Autocomplete:
+
+    URL = '/api/v1/autocomplete/'
+
+    def test_01_prefix_lookup(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(self.URL, {'q': 'ОРЕ'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'titles': [{'id': titles[1]['id'], 'name': titles[1]['name']}],
+            'genres': [],
+            'categories': [],
+        }, (
+            f'Проверьте, что `{self.URL}` находит объекты по началу любого '
+            'слова в названии без учёта регистра.'
+        )
+
+        response = client.get(self.URL, {'q': 'Ко', 'type': 'genres'})
+        assert response.json() == {'genres': [genres[1]]}
+
+        response = client.get(self.URL, {'q': 'к', 'limit': 1})
+        assert [len(found) for found in response.json().values()] == [
+            1, 1, 1
+        ]
+
+        response = client.get(self.URL, {'q': 'к', 'type': 'users'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(self.URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_index_follows_writes(self, client, admin_client):
+        titles, categories, _ = create_titles(admin_client)
+        client.get(self.URL, {'q': 'терм'})
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Хищник'}
+        )
+        response = client.get(self.URL, {'q': 'терм', 'type': 'titles'})
+        assert response.json() == {'titles': []}
+        response = client.get(self.URL, {'q': 'хищ', 'type': 'titles'})
+        assert response.json() == {
+            'titles': [{'id': titles[0]['id'], 'name': 'Хищник'}]
+        }, (
+            'Проверьте, что индекс подсказок обновляется при изменении '
+            'названия произведения.'
+        )
+
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        response = client.get(self.URL, {'q': 'фил', 'type': 'categories'})
+        assert response.json() == {'categories': []}
+
+    def test_03_lookup_speed(self):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение номер {idx}', year=2000)
+            for idx in range(20000)
+        )
+        index = INDEXES['titles']
+        assert len(index.search('номер 1999', 20)) == 11
+
+        started = time.perf_counter()
+        for _ in range(100):
+            index.search('номер 1234', 20)
+        elapsed = (time.perf_counter() - started) / 100
+        assert elapsed < 0.001, (
+            'Поиск подсказки среди 20000 произведений должен занимать '
+            f'меньше миллисекунды, сейчас {elapsed * 1000:.3f} мс.'
+        )
+
+    def test_04_no_rebuild_after_unrelated_writes(
+        self, client, admin_client, user_client
+    ):
+        titles, categories, genres = create_titles(admin_client)
+        client.get(self.URL, {'q': 'терм'})
+
+        create_single_review(user_client, titles[0]['id'], 'Текст', 5)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Хищник',
+            'year': 1987,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.URL, {'q': 'хищ', 'type': 'titles'})
+        assert response.json() == {
+            'titles': [{'id': response.json()['titles'][0]['id'],
+                        'name': 'Хищник'}]
+        }
+        assert not context.captured_queries, (
+            'Проверьте, что создание отзыва и произведения не приводит '
+            'к перестроению индекса подсказок: '
+            f'{[query["sql"] for query in context.captured_queries]}'
+        )
+
+    def test_05_receivers_only_for_indexed_models(self):
+        receivers = (
+            (post_init, remember_autocomplete_values),
+            (post_save, update_autocomplete),
+            (post_delete, update_autocomplete),
+        )
+        for signal, receiver in receivers:
+            for model in MODEL_INDEXES:
+                assert receiver in signal._live_receivers(model)
+            for model in (GenreTitle, OutboxEmail):
+                assert receiver not in signal._live_receivers(model), (
+                    'Проверьте, что обработчики подсказок подключены '
+                    'только к индексируемым моделям, а не к '
+                    f'{model.__name__}.'
+                )
+        assert Collector(using='default').can_fast_delete(
+            GenreTitle.objects.all()
+        ), (
+            'Проверьте, что связи произведений с жанрами удаляются '
+            'одним запросом, без выборки объектов.'
+        )
@@ -0,0 +1,68 @@
+import itertools
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from api.filters import TitleFilter
+from api.views import TitlesViewSet
+from reviews.models import GenreTitle, Title
+from tests.utils import FULL_SCAN, explain, seed_catalog
+
+FILTERS = {
+    'category': 'category-1',
+    'genre': 'genre-3',
+    'year': '1950',
+    'name': 'title',
+    'search': 'title',
+}
+# Частичное совпадение по названию (`LIKE '%...%'`) без других
+# фильтров не может использовать индекс, для поиска есть `search`.
+UNINDEXED = {('name',)}
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Планы запросов SQLite'
+)
+@pytest.mark.django_db(transaction=True)
+class Test15TitleQueryPlans:
+
+    def test_01_filters_use_indexes(self):
+        seed_catalog()
+        for size in range(1, len(FILTERS) + 1):
+            for combination in itertools.combinations(FILTERS, size):
+                if combination in UNINDEXED:
+                    continue
+                params = {name: FILTERS[name] for name in combination}
+                queryset = TitleFilter(
+                    params, queryset=TitlesViewSet.queryset
+                ).qs
+                for query in (queryset[:10], queryset.order_by()):
+                    plan = explain(query)
+                    assert not any(map(FULL_SCAN.match, plan)), (
+                        f'Фильтрация произведений по {combination} '
+                        f'выполняет полный просмотр таблицы: {plan}'
+                    )
+
+    def test_02_genre_prefetch_uses_index(self):
+        seed_catalog()
+        titles = list(Title.objects.values_list('id', flat=True)[:10])
+        plan = explain(GenreTitle.objects.filter(title__in=titles))
+        assert not any(map(FULL_SCAN.match, plan)), plan
+
+
+@pytest.mark.django_db(transaction=True)
+def test_admin_edits_title_genres(client, user_superuser):
+    seed_catalog()
+    client.force_login(user_superuser)
+    title = Title.objects.first()
+    for url in (
+        '/admin/reviews/title/add/',
+        f'/admin/reviews/title/{title.pk}/change/',
+    ):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert 'genretitle_set' in response.content.decode(), (
+            'Проверьте, что жанры произведения можно изменить в админке.'
+        )
+    assert client.get('/admin/reviews/title/').status_code == HTTPStatus.OK
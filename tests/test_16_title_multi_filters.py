@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.filters import TitleFilter
+from api.views import TitlesViewSet
+from tests.utils import FULL_SCAN, create_titles, explain, seed_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleMultiFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == len(data['results']), (
+            'Проверьте, что фильтрация по нескольким жанрам не дублирует '
+            'произведения.'
+        )
+        assert len(context.captured_queries) <= 3
+        return {title['name'] for title in data['results']}
+
+    def test_01_any_and_all(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        horror, comedy, drama = (genre['slug'] for genre in genres)
+        terminator, die_hard = (title['name'] for title in titles)
+
+        assert self.get_names(client, {'genre': horror}) == {terminator}
+        assert self.get_names(
+            client, {'genre': f'{horror},{comedy},{drama}'}
+        ) == {terminator, die_hard}, (
+            f'Проверьте, что `{self.TITLES_URL}?genre=a,b` возвращает '
+            'произведения хотя бы с одним из жанров.'
+        )
+        assert self.get_names(
+            client, {'genre': f'{horror},{comedy}', 'genre_match': 'all'}
+        ) == {terminator}, (
+            f'Проверьте, что `{self.TITLES_URL}?genre=a,b&genre_match=all` '
+            'возвращает только произведения со всеми жанрами.'
+        )
+        assert self.get_names(
+            client, {'genre': f'{horror},{drama}', 'genre_match': 'all'}
+        ) == set()
+
+        slugs = ','.join(category['slug'] for category in categories)
+        assert self.get_names(client, {'category': slugs}) == {
+            terminator, die_hard
+        }
+        assert self.get_names(
+            client, {'category': slugs, 'category_match': 'all'}
+        ) == set()
+        assert self.get_names(
+            client, {'category': slugs, 'genre': drama}
+        ) == {die_hard}
+
+        response = client.get(self.TITLES_URL, {'genre_match': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Планы запросов SQLite'
+    )
+    def test_02_query_plans(self):
+        seed_catalog()
+        for match in ('any', 'all'):
+            queryset = TitleFilter(
+                {'genre': 'genre-3,genre-10', 'genre_match': match},
+                queryset=TitlesViewSet.queryset
+            ).qs
+            plan = explain(queryset[:10])
+            assert not any(map(FULL_SCAN.match, plan)), plan
+            assert queryset.count() == len(set(queryset))
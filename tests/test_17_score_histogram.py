@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.constants import MAX_VALUE_VALIDATOR, MIN_VALUE_VALIDATOR
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+def empty_histogram():
+    return {
+        str(score): 0
+        for score in range(MIN_VALUE_VALIDATOR, MAX_VALUE_VALIDATOR + 1)
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ScoreHistogram:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_histogram(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert 'score_histogram' in response.json(), (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` содержит поле '
+            '`score_histogram`.'
+        )
+        return response.json()['score_histogram']
+
+    def test_01_histogram_follows_reviews(self, client, admin_client,
+                                          user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        expected = empty_histogram()
+        assert self.get_histogram(client, title_id) == expected
+
+        review = create_single_review(user_client, title_id, 'Текст', 10)
+        create_single_review(moderator_client, title_id, 'Текст', 5)
+        expected.update({'10': 1, '5': 1})
+        assert self.get_histogram(client, title_id) == expected, (
+            'Проверьте, что распределение оценок произведения обновляется '
+            'при создании отзыва.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']
+        )
+        response = user_client.patch(review_url, data={'score': 5})
+        assert response.status_code == HTTPStatus.OK
+        expected.update({'10': 0, '5': 2})
+        assert self.get_histogram(client, title_id) == expected, (
+            'Проверьте, что распределение оценок произведения обновляется '
+            'при изменении оценки отзыва.'
+        )
+
+        response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        expected['5'] = 1
+        assert self.get_histogram(client, title_id) == expected, (
+            'Проверьте, что распределение оценок произведения обновляется '
+            'при удалении отзыва.'
+        )
+
+    def test_02_histogram_without_extra_queries(self, client, admin_client,
+                                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Текст', 7)
+        with CaptureQueriesContext(connection) as context:
+            histogram = self.get_histogram(client, title_id)
+        assert histogram['7'] == 1
+        assert len(context.captured_queries) <= 2, (
+            'Проверьте, что распределение оценок отдаётся без '
+            'дополнительных запросов к базе данных.'
+        )
+
+    def test_03_histogram_only_on_detail(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'score_histogram' not in response.json()['results'][0]
+
+    def test_04_rebuild_command(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Текст', 3)
+        Title.objects.update(score_3_count=0, score_9_count=4)
+
+        call_command('rebuild_title_ratings')
+        expected = empty_histogram()
+        expected['3'] = 1
+        assert self.get_histogram(client, title_id) == expected, (
+            'Проверьте, что команда `rebuild_title_ratings` восстанавливает '
+            'распределение оценок по отзывам.'
+        )
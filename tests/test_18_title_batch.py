@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import MAX_BATCH_SIZE
+from reviews.models import Title
+from tests.utils import create_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleBatch:
+
+    BATCH_URL = '/api/v1/titles/batch/'
+
+    def get_batch(self, client, ids):
+        return client.get(
+            f'{self.BATCH_URL}?ids={",".join(map(str, ids))}'
+        )
+
+    def test_01_batch_preserves_order(self, client):
+        create_catalog(5)
+        ids = list(Title.objects.values_list('id', flat=True))
+        requested = [ids[3], ids[0], ids[4], ids[0]]
+        response = self.get_batch(client, requested)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.BATCH_URL}` со списком id '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == requested[:3], (
+            f'Проверьте, что `{self.BATCH_URL}` возвращает произведения в '
+            'порядке запроса и без повторов.'
+        )
+        assert len(data[0]['genre']) == 2
+        assert data[0]['category'] == {'name': 'Фильм', 'slug': 'films'}
+
+    def test_02_batch_query_count_is_constant(self, client):
+        create_catalog(40)
+        ids = list(Title.objects.values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as small:
+            response = self.get_batch(client, ids[:2])
+        assert len(response.json()) == 2
+        with CaptureQueriesContext(connection) as large:
+            response = self.get_batch(client, ids)
+        assert len(response.json()) == 40
+        assert len(small.captured_queries) == len(large.captured_queries), (
+            f'Проверьте, что количество запросов к базе данных у '
+            f'`{self.BATCH_URL}` не зависит от количества произведений.'
+        )
+        assert len(large.captured_queries) <= 2
+
+    def test_03_missing_ids_are_skipped(self, client):
+        create_catalog(1)
+        title_id = Title.objects.get().id
+        response = self.get_batch(client, [title_id + 100, title_id])
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()] == [title_id]
+
+    @pytest.mark.parametrize('ids', [
+        '', 'a,b', '1,,2', '0', '-1', '1,99999999999999999999999'
+    ])
+    def test_04_invalid_ids(self, client, ids):
+        response = client.get(f'{self.BATCH_URL}?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.BATCH_URL}` отклоняет некорректный '
+            'список id.'
+        )
+
+    def test_05_batch_size_is_capped(self, client):
+        response = self.get_batch(client, range(1, MAX_BATCH_SIZE + 2))
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.BATCH_URL}` ограничивает количество '
+            'запрашиваемых произведений.'
+        )
+        response = self.get_batch(client, range(1, MAX_BATCH_SIZE + 1))
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import (count_queries, create_catalog, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_fields(self, client):
+        create_catalog(2)
+        queries, data = count_queries(
+            client, f'{self.TITLES_URL}?fields=id,name,rating'
+        )
+        assert set(data['results'][0]) == {'id', 'name', 'rating'}, (
+            f'Проверьте, что параметр `fields` GET-запроса к '
+            f'`{self.TITLES_URL}` оставляет в ответе только перечисленные '
+            'поля.'
+        )
+        full_queries, _ = count_queries(client, f'{self.TITLES_URL}?x=1')
+        assert queries < full_queries, (
+            'Проверьте, что жанры произведений не загружаются, если поле '
+            '`genre` не запрошено.'
+        )
+
+    def test_02_titles_omit(self, client):
+        create_catalog(1)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                f'{self.TITLES_URL}?omit=description,genre'
+            )
+        assert response.status_code == HTTPStatus.OK
+        title = response.json()['results'][0]
+        assert 'description' not in title and 'genre' not in title
+        assert title['category'] == {'name': 'Фильм', 'slug': 'films'}, (
+            'Проверьте, что параметр `omit` не влияет на поля вложенных '
+            'объектов.'
+        )
+        select = context.captured_queries[-1]['sql']
+        assert 'description' not in select, (
+            'Проверьте, что исключённое поле `description` не читается из '
+            'базы данных.'
+        )
+
+    def test_03_detail_fields(self, client):
+        create_catalog(1)
+        title_id = Title.objects.get().id
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+            + '?fields=id,score_histogram'
+        )
+        assert set(response.json()) == {'id', 'score_histogram'}
+
+    def test_04_reviews_fields(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        create_single_review(user_client, titles[0]['id'], 'Текст', 5)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?fields=id,score,author')
+        assert response.status_code == HTTPStatus.OK
+        review = response.json()['results'][0]
+        assert set(review) == {'id', 'score', 'author'}, (
+            f'Проверьте, что параметр `fields` GET-запроса к `{url}` '
+            'оставляет в ответе только перечисленные поля.'
+        )
+        assert not any(
+            '"text"' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что текст отзыва не читается из базы данных.'
+
+    def test_05_write_ignores_fields(self, admin_client):
+        category, genres = create_catalog(0)
+        response = admin_client.post(
+            f'{self.TITLES_URL}?fields=id',
+            data={
+                'name': 'Новое произведение',
+                'year': 2001,
+                'genre': [genres[0].slug],
+                'category': category.slug,
+            }
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert 'name' in response.json(), (
+            'Проверьте, что параметр `fields` не влияет на запросы на '
+            'запись.'
+        )
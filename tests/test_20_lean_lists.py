@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.lean import (LeanCommentSerializer, LeanReviewSerializer,
+                      LeanTitleSerializer)
+from api.renderers import FastJSONRenderer
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from reviews.models import Comment, Review, Title
+from tests.utils import (create_comments, create_rated_titles,
+                         create_single_review, create_titles)
+
+
+def lean_data(serializer_class, queryset):
+    serializer = serializer_class()
+    return serializer.to_representation(serializer.get_queryset(queryset))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20LeanLists:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_match_serializer(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 7)
+        Title.objects.create(name='Без категории', year=2000)
+        queryset = Title.objects.order_by('-rating', 'id')
+        assert lean_data(LeanTitleSerializer, queryset) == (
+            TitleReadSerializer(queryset, many=True).data
+        ), (
+            'Проверьте, что быстрая сериализация произведений совпадает '
+            'с `TitleReadSerializer`.'
+        )
+
+    def test_02_reviews_and_comments_match_serializer(
+            self, admin_client, user, user_client, moderator,
+            moderator_client):
+        create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        queryset = Review.objects.all()
+        assert lean_data(LeanReviewSerializer, queryset) == (
+            ReviewSerializer(queryset, many=True).data
+        ), (
+            'Проверьте, что быстрая сериализация отзывов совпадает '
+            'с `ReviewSerializer`.'
+        )
+        queryset = Comment.objects.all()
+        assert lean_data(LeanCommentSerializer, queryset) == (
+            CommentSerializer(queryset, many=True).data
+        ), (
+            'Проверьте, что быстрая сериализация комментариев совпадает '
+            'с `CommentSerializer`.'
+        )
+
+    def test_03_lean_list_with_cursor(self, client):
+        create_rated_titles(7)
+        expected = [
+            title['id'] for title in
+            client.get(f'{self.TITLES_URL}?page_size=100').json()['results']
+        ]
+        url = f'{self.TITLES_URL}?pagination=cursor&page_size=3&fields=name'
+        seen = []
+        while url:
+            data = client.get(url).json()
+            seen.extend(title['name'] for title in data['results'])
+            url = data['next']
+        assert seen == [
+            Title.objects.get(pk=pk).name for pk in expected
+        ], (
+            'Проверьте, что курсорная пагинация работает при выборе '
+            'отдельных полей произведений.'
+        )
+
+    @pytest.mark.parametrize('data', [
+        {'name': 'Произведение', 'rating': None, 'genre': []},
+        {'score_histogram': {1: 0, 10: 2}},
+        [{'detail': 'Ошибка'}, 1.5, True],
+    ])
+    def test_04_fast_renderer(self, data):
+        assert json.loads(FastJSONRenderer().render(data)) == json.loads(
+            JSONRenderer().render(data)
+        ), (
+            'Проверьте, что `FastJSONRenderer` формирует тот же JSON, '
+            'что и `JSONRenderer` из DRF.'
+        )
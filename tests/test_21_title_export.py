@@ -0,0 +1,116 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import export
+from reviews.models import Review, Title, User
+from tests.utils import create_catalog, create_single_review, create_titles
+
+
+def read_ndjson(response):
+    content = b''.join(response.streaming_content).decode()
+    assert content.endswith('\n')
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_export_permissions(self, client, user_client,
+                                   moderator_client):
+        assert client.get(self.EXPORT_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        for user_client in (user_client, moderator_client):
+            assert user_client.get(self.EXPORT_URL).status_code == (
+                HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что выгрузка `{self.EXPORT_URL}` доступна '
+                'только администратору.'
+            )
+
+    def test_02_export_matches_list(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 4)
+
+        response = admin_client.get(self.EXPORT_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL}` отдаёт потоковый ответ.'
+        )
+        exported = read_ndjson(response)
+        expected = admin_client.get(
+            f'{self.TITLES_URL}?page_size=100'
+        ).json()['results']
+        assert sorted(exported, key=lambda title: title['id']) == sorted(
+            expected, key=lambda title: title['id']
+        ), (
+            f'Проверьте, что `{self.EXPORT_URL}` выгружает все произведения '
+            'с категорией, жанрами и рейтингом.'
+        )
+
+    def test_03_export_with_reviews(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 9)
+        exported = read_ndjson(
+            admin_client.get(f'{self.EXPORT_URL}?with_reviews=true')
+        )
+        reviews = {title['id']: title['reviews'] for title in exported}
+        assert [review['score'] for review in reviews[titles[0]['id']]] == [
+            9
+        ], (
+            'Проверьте, что параметр `with_reviews` добавляет к '
+            'выгружаемым произведениям их отзывы.'
+        )
+        assert reviews[titles[1]['id']] == []
+
+    def test_04_export_queries_per_chunk(self, admin_client):
+        create_catalog(10)
+        with CaptureQueriesContext(connection) as context:
+            lines = b''.join(
+                export.iter_ndjson(with_reviews=True, chunk_size=4)
+            ).splitlines()
+        assert len(lines) == Title.objects.count()
+        assert len(context.captured_queries) == 3 * 3 + 1, (
+            'Проверьте, что выгрузка выполняет постоянное количество '
+            'запросов на порцию произведений.'
+        )
+
+    def test_05_reviews_streamed_in_chunks(self):
+        create_catalog(3)
+        titles = list(Title.objects.order_by('id'))
+        User.objects.bulk_create(
+            User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+            for idx in range(9)
+        )
+        Review.objects.bulk_create(
+            Review(title=titles[1], author=author, text='Текст', score=5)
+            for author in User.objects.all()
+        )
+        with CaptureQueriesContext(connection) as context:
+            exported = [
+                json.loads(line) for line in b''.join(
+                    export.iter_ndjson(with_reviews=True, chunk_size=4)
+                ).splitlines()
+            ]
+        review_queries = [
+            query for query in context.captured_queries
+            if 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(review_queries) == 4, (
+            'Проверьте, что отзывы выгружаются порциями не больше '
+            'размера порции произведений.'
+        )
+        assert [len(title['reviews']) for title in exported] == [0, 9, 0]
+        assert [review['id'] for review in exported[1]['reviews']] == list(
+            Review.objects.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        )
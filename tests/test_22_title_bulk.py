@@ -0,0 +1,160 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_catalog
+
+
+def bulk_titles(size, genres=('drama', 'comedy')):
+    return [
+        {
+            'name': f'Сезон {idx}',
+            'year': 2000 + idx,
+            'genre': list(genres),
+            'category': 'films',
+        }
+        for idx in range(size)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_bulk_permissions(self, client, user_client):
+        assert client.post(
+            self.BULK_URL, data='[]', content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            self.BULK_URL, data='[]', content_type='application/json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.BULK_URL}` доступен только '
+            'администратору.'
+        )
+
+    def test_02_bulk_create(self, admin_client):
+        create_catalog(0)
+        response = admin_client.post(
+            self.BULK_URL, data=bulk_titles(3), format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` со списком '
+            'произведений возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert [title['name'] for title in data] == [
+            'Сезон 0', 'Сезон 1', 'Сезон 2'
+        ]
+        assert {genre['slug'] for genre in data[0]['genre']} == {
+            'drama', 'comedy'
+        }
+        assert data[0]['category']['slug'] == 'films'
+        assert Title.objects.count() == 3
+
+        listed = admin_client.get(self.TITLES_URL).json()
+        assert listed['count'] == 3, (
+            'Проверьте, что после массового создания кэш списка '
+            'произведений сбрасывается.'
+        )
+
+    def test_03_bulk_create_query_count(self, admin_client):
+        create_catalog(0)
+        with CaptureQueriesContext(connection) as small:
+            admin_client.post(
+                self.BULK_URL, data=bulk_titles(2), format='json'
+            )
+        with CaptureQueriesContext(connection) as large:
+            admin_client.post(
+                self.BULK_URL, data=bulk_titles(20), format='json'
+            )
+        inserts = [
+            query['sql'] for query in large.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_title_genre"')
+        ]
+        assert len(inserts) == 1, (
+            'Проверьте, что связи с жанрами записываются одной вставкой.'
+        )
+        selects = [
+            len([
+                query for query in context.captured_queries
+                if 'FROM "reviews_genre"' in query['sql']
+                or 'FROM "reviews_category"' in query['sql']
+            ])
+            for context in (small, large)
+        ]
+        assert selects[0] == selects[1], (
+            'Проверьте, что слаги категорий и жанров разрешаются '
+            'постоянным количеством запросов.'
+        )
+
+    def test_04_bulk_errors_per_item(self, admin_client):
+        create_catalog(0)
+        titles = bulk_titles(3)
+        titles[1]['genre'] = ['drama', 'unknown']
+        titles[2]['year'] = 'год'
+        response = admin_client.post(
+            self.BULK_URL, data=titles, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            f'Проверьте, что `{self.BULK_URL}` возвращает ошибки списком '
+            'по позициям произведений.'
+        )
+        assert 'year' in errors[2]
+        assert Title.objects.count() == 0, (
+            'Проверьте, что при ошибке в одном из произведений не '
+            'создаётся ни одно.'
+        )
+
+        titles = bulk_titles(2)
+        titles[0]['category'] = 'unknown'
+        errors = admin_client.post(
+            self.BULK_URL, data=titles, format='json'
+        ).json()
+        assert 'category' in errors[0] and errors[1] == {}
+
+    def test_05_bulk_update(self, admin_client):
+        create_catalog(0)
+        created = admin_client.post(
+            self.BULK_URL, data=bulk_titles(3), format='json'
+        ).json()
+        response = admin_client.patch(
+            self.BULK_URL,
+            data=[
+                {'id': created[2]['id'], 'name': 'Новое название'},
+                {'id': created[0]['id'], 'genre': ['comedy']},
+            ],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что PATCH-запрос к `{self.BULK_URL}` изменяет '
+            'произведения.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [
+            created[2]['id'], created[0]['id']
+        ]
+        assert data[0]['name'] == 'Новое название'
+        assert len(data[0]['genre']) == 2
+        assert data[1]['genre'] == [{'name': 'Комедия', 'slug': 'comedy'}]
+        assert data[1]['name'] == created[0]['name']
+
+    def test_06_bulk_update_unknown_id(self, admin_client):
+        create_catalog(1)
+        title_id = Title.objects.get().id
+        response = admin_client.patch(
+            self.BULK_URL,
+            data=[{'id': title_id, 'name': 'Другое'}, {'name': 'Без id'},
+                  {'id': title_id + 100, 'name': 'Нет такого'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {} and 'id' in errors[1] and 'id' in errors[2]
+        assert Title.objects.get().name != 'Другое'
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_catalog
+
+
+def count_selects(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ], response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23CachedCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_count_is_shared_between_pages(self, client):
+        create_catalog(5)
+        counts, data = count_selects(
+            client, f'{self.TITLES_URL}?page_size=2'
+        )
+        assert data['count'] == 5 and len(counts) == 1
+        counts, data = count_selects(
+            client, f'{self.TITLES_URL}?page_size=2&page=2&fields=id'
+        )
+        assert data['count'] == 5
+        assert not counts, (
+            f'Проверьте, что количество произведений в ответе '
+            f'`{self.TITLES_URL}` считается один раз для всех страниц '
+            'выборки.'
+        )
+
+    def test_02_count_depends_on_filters(self, client):
+        create_catalog(3)
+        Title.objects.filter(
+            pk=Title.objects.order_by('id').first().pk
+        ).update(year=1990)
+        assert client.get(self.TITLES_URL).json()['count'] == 3
+        counts, data = count_selects(client, f'{self.TITLES_URL}?year=1990')
+        assert data['count'] == 1 and len(counts) == 1, (
+            'Проверьте, что количество произведений кэшируется отдельно '
+            'для каждого набора фильтров.'
+        )
+
+    def test_03_count_follows_changes(self, client, admin_client):
+        create_catalog(2)
+        assert client.get(self.TITLES_URL).json()['count'] == 2
+        title = Title.objects.order_by('id').first()
+        response = admin_client.delete(f'{self.TITLES_URL}{title.id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(
+            f'{self.TITLES_URL}?page=1'
+        ).json()['count'] == 1, (
+            'Проверьте, что количество произведений пересчитывается после '
+            'их изменения.'
+        )
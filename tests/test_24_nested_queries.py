@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+def capture(method, url, expected_status, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        response = method(url, **kwargs)
+    assert response.status_code == expected_status
+    return [query['sql'] for query in context.captured_queries], response
+
+
+def parent_selects(queries, table):
+    return [
+        sql for sql in queries
+        if sql.startswith('SELECT') and f'FROM "{table}" WHERE' in sql
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24NestedQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.mark.parametrize('action, limit', [
+        ('create', 5), ('list', 4), ('retrieve', 3)
+    ])
+    def test_01_reviews(self, admin_client, user_client, moderator_client,
+                        action, limit):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review = create_single_review(
+            moderator_client, titles[0]['id'], 'Текст', 3
+        ).json()
+        queries, _ = {
+            'create': lambda: capture(
+                user_client.post, url, HTTPStatus.CREATED,
+                data={'text': 'Текст', 'score': 5}
+            ),
+            'list': lambda: capture(user_client.get, url, HTTPStatus.OK),
+            'retrieve': lambda: capture(
+                user_client.get, f'{url}{review["id"]}/', HTTPStatus.OK
+            ),
+        }[action]()
+        assert len(parent_selects(queries, 'reviews_title')) == 1, (
+            f'Проверьте, что при запросе к `{self.REVIEWS_URL_TEMPLATE}` '
+            'произведение загружается из базы данных один раз.'
+        )
+        assert len(queries) <= limit, (
+            f'Проверьте количество запросов к базе данных при действии '
+            f'`{action}` для `{self.REVIEWS_URL_TEMPLATE}`: ожидалось не '
+            f'больше {limit}, выполнено {len(queries)}.'
+        )
+
+    @pytest.mark.parametrize('action, limit', [
+        ('create', 5), ('list', 4), ('retrieve', 3)
+    ])
+    def test_02_comments(self, admin_client, user_client, moderator_client,
+                         action, limit):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            moderator_client, titles[0]['id'], 'Текст', 3
+        ).json()
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review['id']
+        )
+        comment = create_single_comment(
+            moderator_client, titles[0]['id'], review['id'], 'Текст'
+        ).json()
+        queries, _ = {
+            'create': lambda: capture(
+                user_client.post, url, HTTPStatus.CREATED,
+                data={'text': 'Текст'}
+            ),
+            'list': lambda: capture(user_client.get, url, HTTPStatus.OK),
+            'retrieve': lambda: capture(
+                user_client.get, f'{url}{comment["id"]}/', HTTPStatus.OK
+            ),
+        }[action]()
+        assert len(parent_selects(queries, 'reviews_review')) == 1, (
+            f'Проверьте, что при запросе к `{self.COMMENTS_URL_TEMPLATE}` '
+            'отзыв загружается из базы данных один раз.'
+        )
+        assert len(queries) <= limit, (
+            f'Проверьте количество запросов к базе данных при действии '
+            f'`{action}` для `{self.COMMENTS_URL_TEMPLATE}`: ожидалось не '
+            f'больше {limit}, выполнено {len(queries)}.'
+        )
@@ -0,0 +1,88 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+UNIQUE_REVIEW_MESSAGE = (
+    'На одно произведение пользователь может оставить только один отзыв.'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ReviewUniqueness:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_review(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Текст', 5)
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            data={'text': 'Ещё отзыв', 'score': 1}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': [UNIQUE_REVIEW_MESSAGE]
+        }, (
+            'Проверьте, что повторный отзыв на произведение отклоняется '
+            'с прежним сообщением об ошибке.'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count) == (5, 1), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг произведения.'
+        )
+
+    def test_02_create_without_precheck(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            create_single_review(user_client, titles[0]['id'], 'Текст', 5)
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ], (
+            'Проверьте, что при создании отзыва уникальность проверяется '
+            'ограничением базы данных, без отдельного запроса.'
+        )
+
+    def test_03_concurrent_reviews(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        submits = 4
+        barrier = threading.Barrier(submits)
+        statuses = []
+
+        def submit(score):
+            try:
+                barrier.wait()
+                statuses.append(user_client.post(
+                    url, data={'text': 'Текст', 'score': score}
+                ).status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=submit, args=(score,))
+            for score in range(1, submits + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(statuses) == [HTTPStatus.CREATED] + [
+            HTTPStatus.BAD_REQUEST
+        ] * (submits - 1), (
+            'Проверьте, что из параллельных отзывов одного пользователя на '
+            'одно произведение сохраняется только один.'
+        )
+        review = Review.objects.get(title_id=title_id)
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count) == (review.score, 1)
@@ -0,0 +1,45 @@
+import pytest
+
+from api.views import CommentViewSet, ReviewViewSet
+from tests.utils import count_queries, create_discussion
+
+SIZE = 100
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AuthorQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_constant(self, client, url):
+        small, data = count_queries(client, f'{url}?page_size=10')
+        assert len(data['results']) == 10
+        assert data['results'][0]['author'].startswith('author')
+        large, data = count_queries(client, f'{url}?page_size={SIZE}')
+        assert len(data['results']) == SIZE
+        assert small == large, (
+            f'Проверьте, что количество запросов к базе данных при '
+            f'GET-запросе к `{url}` не зависит от размера страницы: '
+            f'{small} запросов для 10 объектов и {large} для {SIZE}.'
+        )
+
+    @pytest.mark.parametrize('lean', [True, False])
+    def test_01_reviews(self, client, monkeypatch, lean):
+        if not lean:
+            monkeypatch.setattr(ReviewViewSet, 'lean_serializer_class', None)
+        title, _ = create_discussion(SIZE)
+        self.check_constant(
+            client, self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        )
+
+    @pytest.mark.parametrize('lean', [True, False])
+    def test_02_comments(self, client, monkeypatch, lean):
+        if not lean:
+            monkeypatch.setattr(CommentViewSet, 'lean_serializer_class', None)
+        title, review = create_discussion(SIZE)
+        self.check_constant(client, self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        ))
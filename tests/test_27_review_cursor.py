@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from api.pagination import KeysetPagination
+from reviews.models import Comment, Review, Title
+from tests.utils import create_discussion, explain, walk
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ReviewCursor:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_cursor_matches_page_order(self, client):
+        title, review = create_discussion()
+        for url in (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+        ):
+            expected = [
+                obj['id'] for obj in
+                client.get(f'{url}?page_size=100').json()['results']
+            ]
+            assert walk(
+                client, f'{url}?pagination=cursor&page_size=7'
+            ) == expected, (
+                f'Проверьте, что курсорная пагинация `{url}` возвращает '
+                'объекты по дате публикации без пропусков и повторов.'
+            )
+
+    def test_02_new_reviews_do_not_shift_pages(self, client, user):
+        title, _ = create_discussion()
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = client.get(f'{url}?pagination=cursor&page_size=30').json()
+        seen = [review['id'] for review in data['results']]
+        Review.objects.create(
+            title=title, author=user, text='Новый отзыв', score=1
+        )
+        seen += walk(client, data['next'])
+        assert len(seen) == len(set(seen)) == Review.objects.count(), (
+            f'Проверьте, что новые отзывы не приводят к повторам при '
+            f'курсорной пагинации `{url}`.'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Планы запросов SQLite'
+    )
+    def test_03_cursor_uses_index(self):
+        title, review = create_discussion()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for queryset, index in (
+            (Review.objects.filter(title=title), 'review_title_pub_date_idx'),
+            (Comment.objects.filter(review=review),
+             'comment_review_pub_date_idx'),
+        ):
+            ordering = ('pub_date', 'id')
+            last = queryset.order_by(*ordering)[10]
+            position = KeysetPagination()
+            position.model = queryset.model
+            page = queryset.order_by(*ordering).filter(
+                position.get_position_filter(
+                    queryset.model, ordering,
+                    position._get_position_from_instance(last, ordering)
+                )
+            )[:10]
+            plan = ' '.join(explain(page))
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что курсорная пагинация использует индекс '
+                f'`{index}` без сортировки: {plan}'
+            )
+
+    def test_04_empty_result(self, client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        response = client.get(
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)}'
+            '?pagination=cursor'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что курсорная пагинация отзывов произведения '
+            'без отзывов не приводит к ошибке.'
+        )
+        data = response.json()
+        assert data['results'] == []
+        assert data['next'] is None and data['previous'] is None
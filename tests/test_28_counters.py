@@ -0,0 +1,216 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.views import TitlesViewSet
+from reviews.models import Comment, Review, Title, User
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles, explain)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Counters:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
+    )
+
+    def get_review(self, client, title_id, review_id):
+        response = client.get(
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)}'
+            f'{review_id}/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_reviews_count(self, client, admin_client, user_client,
+                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        assert client.get(url).json()['reviews_count'] == 0
+        create_single_review(user_client, title_id, 'Текст', 5)
+        review = create_single_review(moderator_client, title_id, 'Текст', 3)
+        assert client.get(url).json()['reviews_count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` содержит количество '
+            'отзывов `reviews_count`.'
+        )
+        moderator_client.delete(
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)}'
+            f'{review.json()["id"]}/'
+        )
+        listed = client.get(self.TITLES_URL).json()['results']
+        assert {
+            title['id']: title['reviews_count'] for title in listed
+        }[title_id] == 1
+
+    def test_02_comments_count(self, client, admin_client, user, user_client,
+                               moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            moderator_client, title_id, 'Текст', 5
+        ).json()['id']
+        assert self.get_review(client, title_id, review_id)[
+            'comments_count'
+        ] == 0
+        comment = create_single_comment(
+            moderator_client, title_id, review_id, 'Текст'
+        ).json()
+        create_single_comment(user_client, title_id, review_id, 'Текст')
+        reviews = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        ).json()['results']
+        assert reviews[0]['comments_count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.REVIEWS_URL_TEMPLATE}` содержит количество '
+            'комментариев `comments_count`.'
+        )
+
+        response = moderator_client.delete(
+            self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id,
+                comment_id=comment['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_review(client, title_id, review_id)[
+            'comments_count'
+        ] == 1, (
+            'Проверьте, что счётчик комментариев уменьшается при удалении '
+            'комментария.'
+        )
+        user.delete()
+        assert Review.objects.get(pk=review_id).comments_count == 0, (
+            'Проверьте, что счётчик комментариев уменьшается при каскадном '
+            'удалении комментариев вместе с автором.'
+        )
+
+    def test_03_order_by_reviews_count(self, client, admin_client,
+                                       user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'Текст', 1)
+        create_single_review(moderator_client, titles[1]['id'], 'Текст', 1)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 10)
+        expected = [titles[1]['id'], titles[0]['id']]
+        for params in ('', '&pagination=cursor'):
+            data = client.get(
+                f'{self.TITLES_URL}?ordering=-reviews_count{params}'
+            ).json()
+            assert [
+                title['id'] for title in data['results']
+            ][:2] == expected, (
+                f'Проверьте, что параметр `ordering=-reviews_count` '
+                f'сортирует `{self.TITLES_URL}` по количеству отзывов.'
+            )
+        response = client.get(f'{self.TITLES_URL}?ordering=name')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Планы запросов SQLite'
+    )
+    def test_04_reviews_count_ordering_uses_index(self):
+        Title.objects.bulk_create(
+            Title(name=f'Title {idx}', year=2000, reviews_count=idx % 50)
+            for idx in range(2000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        plan = explain(
+            TitlesViewSet.queryset.order_by('-reviews_count', 'id')[:10]
+        )
+        assert any('title_reviews_count_id_idx' in step for step in plan), (
+            'Проверьте, что сортировка по количеству отзывов использует '
+            f'индекс: {plan}'
+        )
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+
+    def test_05_rebuild_comment_counts(self, admin_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        review_id = create_single_review(
+            moderator_client, titles[0]['id'], 'Текст', 5
+        ).json()['id']
+        create_single_comment(
+            moderator_client, titles[0]['id'], review_id, 'Текст'
+        )
+        Review.objects.update(comments_count=7)
+        call_command('rebuild_comment_counts', chunk_size=1)
+        assert Review.objects.get(pk=review_id).comments_count == 1, (
+            'Проверьте, что команда `rebuild_comment_counts` '
+            'восстанавливает счётчики комментариев.'
+        )
+
+    def test_06_orm_comment_delete_changes_etag(
+        self, client, admin_client, moderator_client
+    ):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            moderator_client, title_id, 'Текст', 5
+        ).json()['id']
+        create_single_comment(moderator_client, title_id, review_id, 'Текст')
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        etag = client.get(url)['ETag']
+
+        Comment.objects.get().delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария вне API меняет ETag '
+            f'списка `{self.REVIEWS_URL_TEMPLATE}`.'
+        )
+        assert response.json()['results'][0]['comments_count'] == 0
+
+        etag = response['ETag']
+        Review.objects.update(comments_count=3)
+        call_command('rebuild_comment_counts')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что команда `rebuild_comment_counts` сбрасывает '
+            'кэш отзывов исправленных произведений.'
+        )
+        assert response.json()['results'][0]['comments_count'] == 0
+
+    def test_07_cascade_delete_query_count(self, admin_client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        User.objects.bulk_create(
+            User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+            for idx in range(20)
+        )
+        authors = list(User.objects.filter(username__startswith='author'))
+        for author in authors:
+            review = Review.objects.create(
+                title=title, author=author, text='Текст', score=5
+            )
+            Comment.objects.bulk_create(
+                Comment(review=review, author=author, text='Текст')
+                for _ in range(10)
+            )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(
+                self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+            )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not Comment.objects.exists()
+        assert len(context.captured_queries) <= 15, (
+            'Проверьте, что каскадное удаление произведения не обновляет '
+            'счётчики удаляемых отзывов и произведения: '
+            f'{len(context.captured_queries)} запросов.'
+        )
+
+        review = Review.objects.create(
+            title=Title.objects.create(name='Другое', year=2000),
+            author=authors[0], text='Текст', score=5
+        )
+        Comment.objects.create(review=review, author=authors[1], text='Текст')
+        authors[1].delete()
+        assert Review.objects.get().comments_count == 0, (
+            'Проверьте, что счётчик комментариев уменьшается, если '
+            'отзыв не удаляется вместе с комментариями.'
+        )
@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from api.pagination import KeysetPagination
+from reviews.models import Comment, Review, Title
+from tests.utils import count_queries, explain, walk
+
+SIZE = 25
+
+
+def create_activity(author, other):
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000) for idx in range(SIZE)
+    )
+    titles = list(Title.objects.all())
+    Review.objects.bulk_create(
+        Review(title=title, author=user, text='Текст', score=5)
+        for title in titles for user in (author, other)
+    )
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Текст')
+        for review in Review.objects.all() for user in (author, other)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29UserActivity:
+
+    USER_REVIEWS_URL_TEMPLATE = '/api/v1/users/{username}/reviews/'
+    USER_COMMENTS_URL_TEMPLATE = '/api/v1/users/{username}/comments/'
+
+    def test_01_user_reviews(self, client, user, moderator):
+        create_activity(user, moderator)
+        url = self.USER_REVIEWS_URL_TEMPLATE.format(username=user.username)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.USER_REVIEWS_URL_TEMPLATE}` '
+            'доступен без токена.'
+        )
+        data = response.json()
+        assert 'count' not in data and 'next' in data
+        review = Review.objects.filter(author=user).select_related(
+            'title'
+        ).latest('pub_date', 'id')
+        assert data['results'][0] == {
+            'id': review.id,
+            'text': review.text,
+            'author': user.username,
+            'score': review.score,
+            'pub_date': data['results'][0]['pub_date'],
+            'comments_count': review.comments_count,
+            'title': {'id': review.title.id, 'name': review.title.name},
+        }, (
+            f'Проверьте, что `{self.USER_REVIEWS_URL_TEMPLATE}` отдаёт '
+            'отзывы пользователя от новых к старым со ссылкой на '
+            'произведение.'
+        )
+        seen = walk(client, f'{url}?page_size=7')
+        assert seen == list(
+            Review.objects.filter(author=user).order_by(
+                '-pub_date', '-id'
+            ).values_list('id', flat=True)
+        )
+
+    def test_02_user_comments(self, client, user, moderator):
+        create_activity(user, moderator)
+        url = self.USER_COMMENTS_URL_TEMPLATE.format(username=user.username)
+        data = client.get(url).json()
+        comment = Comment.objects.filter(author=user).select_related(
+            'review'
+        ).latest('pub_date', 'id')
+        assert data['results'][0]['review'] == {
+            'id': comment.review.id, 'title': comment.review.title_id
+        }, (
+            f'Проверьте, что `{self.USER_COMMENTS_URL_TEMPLATE}` отдаёт '
+            'комментарии пользователя со ссылкой на отзыв и произведение.'
+        )
+        seen = walk(client, f'{url}?page_size=9')
+        assert len(seen) == len(set(seen)) == SIZE * 2
+        assert set(seen) == set(
+            Comment.objects.filter(author=user).values_list('id', flat=True)
+        )
+
+    def test_03_unknown_user(self, client):
+        for template in (
+            self.USER_REVIEWS_URL_TEMPLATE, self.USER_COMMENTS_URL_TEMPLATE
+        ):
+            response = client.get(template.format(username='nobody'))
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_empty_feed(self, client, user):
+        for template in (
+            self.USER_REVIEWS_URL_TEMPLATE, self.USER_COMMENTS_URL_TEMPLATE
+        ):
+            response = client.get(template.format(username=user.username))
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `{template}` для пользователя без '
+                'отзывов и комментариев возвращает пустой список.'
+            )
+            assert response.json()['results'] == []
+
+    def test_05_query_count_is_constant(self, client, user, moderator):
+        create_activity(user, moderator)
+        for template in (
+            self.USER_REVIEWS_URL_TEMPLATE, self.USER_COMMENTS_URL_TEMPLATE
+        ):
+            url = template.format(username=user.username)
+            small_page, data = count_queries(client, f'{url}?page_size=2')
+            assert len(data['results']) == 2
+            large_page, data = count_queries(client, f'{url}?page_size=20')
+            assert len(data['results']) == 20
+            assert small_page == large_page <= 2, (
+                f'Проверьте, что GET-запрос к `{template}` выполняет '
+                'постоянное количество запросов к базе данных: '
+                f'{small_page} и {large_page}.'
+            )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Планы запросов SQLite'
+    )
+    def test_06_cursor_uses_index(self, user, moderator):
+        create_activity(user, moderator)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for model, index in (
+            (Review, 'review_author_pub_date_idx'),
+            (Comment, 'comment_author_pub_date_idx'),
+        ):
+            ordering = ('-pub_date', '-id')
+            queryset = model.objects.filter(author=user).order_by(*ordering)
+            position = KeysetPagination()
+            position.model = model
+            page = queryset.filter(position.get_position_filter(
+                model, ordering,
+                position._get_position_from_instance(queryset[5], ordering)
+            ))[:10]
+            plan = ' '.join(explain(page))
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что лента пользователя использует индекс '
+                f'`{index}` без сортировки: {plan}'
+            )
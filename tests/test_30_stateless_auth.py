@@ -0,0 +1,144 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import TOKEN_VERSION_TIMEOUT
+from api.cache import TOKEN_VERSION_KEY
+from reviews.models import Category
+from tests.utils import count_queries
+
+
+def get_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30StatelessAuth:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    CACHE_STATS_URL = '/api/v1/cache/stats/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    USERS_ME_URL = '/api/v1/users/me/'
+
+    def obtain_token(self, client, user):
+        user.confirmation_code = '123456'
+        user.save()
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': '123456'
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['token']
+
+    def test_01_no_user_query(self, client, admin):
+        token = self.obtain_token(client, admin)
+        assert AccessToken(token)['role'] == admin.role
+        admin_client = get_client(token)
+        admin_client.get(self.CACHE_STATS_URL)
+        queries, _ = count_queries(admin_client, self.CACHE_STATS_URL)
+        assert queries == 0, (
+            f'Проверьте, что токен из `{self.URL_TOKEN}` позволяет '
+            'аутентифицировать пользователя без запроса к базе данных.'
+        )
+
+        queries, _ = count_queries(
+            get_client(AccessToken.for_user(admin)), self.CACHE_STATS_URL
+        )
+        assert queries == 1, (
+            'Проверьте, что токены без данных пользователя '
+            'по-прежнему проверяются по базе данных.'
+        )
+
+    def test_02_author_permissions(self, client, user, admin):
+        user_client = get_client(self.obtain_token(client, user))
+        response = user_client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = get_client(self.obtain_token(client, admin)).post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Category.objects.filter(slug='films').exists()
+
+        response = user_client.get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email, (
+            f'Проверьте, что `{self.USERS_ME_URL}` отдаёт все поля '
+            'пользователя, аутентифицированного по токену.'
+        )
+
+    def test_03_role_change_revokes_token(self, client, admin):
+        token = self.obtain_token(client, admin)
+        admin_client = get_client(token)
+        assert admin_client.get(
+            self.CACHE_STATS_URL
+        ).status_code == HTTPStatus.OK
+        admin.role = 'user'
+        admin.save()
+        response = admin_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что смена роли пользователя отзывает выданные '
+            'ему токены.'
+        )
+        response = get_client(self.obtain_token(client, admin)).get(
+            self.CACHE_STATS_URL
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_deleted_or_inactive_user(self, client, admin, moderator):
+        admin_client = get_client(self.obtain_token(client, admin))
+        moderator_client = get_client(self.obtain_token(client, moderator))
+        admin.delete()
+        moderator.is_active = False
+        moderator.save()
+        for api_client in (admin_client, moderator_client):
+            response = api_client.get(self.USERS_ME_URL)
+            assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+                'Проверьте, что токены удалённых и неактивных '
+                'пользователей отклоняются.'
+            )
+
+    def test_05_cache_miss(self, client, admin):
+        admin_client = get_client(self.obtain_token(client, admin))
+        cache.clear()
+        queries, _ = count_queries(admin_client, self.CACHE_STATS_URL)
+        assert queries == 1
+        admin.role = 'user'
+        admin.save()
+        cache.clear()
+        response = admin_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что при промахе кэша версия токенов берётся '
+            'из базы данных.'
+        )
+
+    def test_06_stale_version_in_other_process(self, client, admin):
+        token = self.obtain_token(client, admin)
+        admin_client = get_client(token)
+        key = TOKEN_VERSION_KEY.format(user_id=admin.pk)
+        version = admin.token_version
+        admin.role = 'user'
+        admin.save()
+        # Другой процесс с кэшем в памяти ещё хранит прежнюю версию.
+        cache.set(key, version, TOKEN_VERSION_TIMEOUT)
+        assert admin_client.get(
+            self.CACHE_STATS_URL
+        ).status_code == HTTPStatus.OK
+
+        expired = time.time() + TOKEN_VERSION_TIMEOUT + 1
+        with mock.patch(
+            'django.core.cache.backends.locmem.time.time',
+            return_value=expired
+        ):
+            response = admin_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что устаревшая версия токенов хранится в кэше '
+            'ограниченное время и отзыв токенов доходит до всех процессов.'
+        )
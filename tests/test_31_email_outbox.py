@@ -0,0 +1,112 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+def create_emails(size):
+    OutboxEmail.objects.bulk_create(
+        OutboxEmail(
+            to=f'user{idx}@yamdb.fake', subject='Тема', body='Текст'
+        )
+        for idx in range(size)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_does_not_send(self, client):
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=AssertionError
+        ):
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не '
+            'отправляет письмо, а ставит его в очередь.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.to == data['email'] and email.sent_at is None
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [data['email']]
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что команда `send_emails` не отправляет письма '
+            'повторно.'
+        )
+
+    def test_02_batches_reuse_connection(self):
+        create_emails(7)
+        with mock.patch.object(
+            EmailBackend, 'open', autospec=True, return_value=True
+        ) as open_connection, CaptureQueriesContext(connection) as context:
+            call_command('send_emails', batch_size=3)
+        assert len(mail.outbox) == 7
+        assert open_connection.call_count == 3, (
+            'Проверьте, что команда `send_emails` открывает одно '
+            'соединение на порцию писем.'
+        )
+        updates = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        assert len(updates) == 6
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_03_retry_with_backoff(self):
+        create_emails(2)
+        first = OutboxEmail.objects.first()
+        original = EmailBackend.send_messages
+
+        def fail_first(backend, messages):
+            if messages[0].to == [first.to]:
+                raise ConnectionError('SMTP недоступен')
+            return original(backend, messages)
+
+        with mock.patch.object(
+            EmailBackend, 'send_messages', autospec=True,
+            side_effect=fail_first
+        ):
+            call_command('send_emails', backoff=60)
+        assert len(mail.outbox) == 1
+        first.refresh_from_db()
+        assert first.sent_at is None and first.attempts == 1
+        assert 'SMTP' in first.last_error
+        assert first.next_attempt_at > timezone.now() + timedelta(
+            seconds=50
+        ), 'Проверьте, что повторная отправка откладывается.'
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails')
+        assert len(mail.outbox) == 2, (
+            'Проверьте, что письмо отправляется повторно после задержки.'
+        )
+
+    def test_04_attempts_are_limited(self):
+        create_emails(1)
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=ConnectionError
+        ):
+            call_command('send_emails', backoff=0, max_attempts=3)
+        email = OutboxEmail.objects.get()
+        assert email.attempts == 3 and email.sent_at is None
+        call_command('send_emails', max_attempts=3)
+        assert not mail.outbox
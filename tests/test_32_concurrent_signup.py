@@ -0,0 +1,90 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+from reviews.models import OutboxEmail, User
+from tests.utils import capture_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32ConcurrentSignup:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_query_count(self, client):
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        for expected in (3, 2):
+            queries, response = capture_queries(client, self.URL_SIGNUP, data)
+            assert response.status_code == HTTPStatus.OK
+            selects = [sql for sql in queries if sql.startswith('SELECT')]
+            assert len(selects) == 1 and len(queries) == expected, (
+                f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` '
+                'проверяет email и username одним запросом и создаёт '
+                f'пользователя без повторного сохранения: {queries}'
+            )
+        assert OutboxEmail.objects.count() == 2
+
+    def test_02_conflict_messages(self, client):
+        client.post(self.URL_SIGNUP, data={
+            'email': 'first@yamdb.fake', 'username': 'first'
+        })
+        for data, message in (
+            ({'email': 'first@yamdb.fake', 'username': 'second'},
+             'Адрес электронной почты уже существует.'),
+            ({'email': 'second@yamdb.fake', 'username': 'first'},
+             'Имя пользователя уже существует.'),
+        ):
+            queries, response = capture_queries(client, self.URL_SIGNUP, data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert response.json() == {'non_field_errors': [message]}
+            assert len(queries) == 1
+        assert User.objects.count() == 1
+
+    def test_03_concurrent_signups(self):
+        requests = [
+            {'email': 'same@yamdb.fake', 'username': 'same'},
+            {'email': 'same@yamdb.fake', 'username': 'same'},
+            {'email': 'same@yamdb.fake', 'username': 'same'},
+            {'email': 'same@yamdb.fake', 'username': 'other'},
+            {'email': 'other@yamdb.fake', 'username': 'same'},
+            {'email': 'third@yamdb.fake', 'username': 'third'},
+        ]
+        barrier = threading.Barrier(len(requests))
+        results = []
+
+        def signup(data):
+            try:
+                barrier.wait()
+                response = APIClient().post(self.URL_SIGNUP, data=data)
+                results.append((data['email'], data['username'],
+                                response.status_code))
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=signup, args=(data,))
+            for data in requests
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == len(requests)
+        assert {status for *_, status in results} <= {
+            HTTPStatus.OK, HTTPStatus.BAD_REQUEST
+        }, (
+            f'Проверьте, что параллельные POST-запросы к `{self.URL_SIGNUP}` '
+            f'не приводят к ошибке сервера: {results}'
+        )
+        users = set(User.objects.values_list('email', 'username'))
+        for email, username, status in results:
+            assert (status == HTTPStatus.OK) == (
+                (email, username) in users
+            ), results
+        assert len({email for email, _ in users}) == len(users)
+        assert len({username for _, username in users}) == len(users)
+        assert ('third@yamdb.fake', 'third') in users
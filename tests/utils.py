@@ -1,5 +1,15 @@
+import re
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE', 'ROLLBACK')
+FULL_SCAN = re.compile(r'^SCAN reviews_title(_genre)?( |$)(?!.*VIRTUAL)')
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +315,114 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def capture_queries(client, url, data=None):
+    with CaptureQueriesContext(connection) as context:
+        if data is None:
+            response = client.get(url)
+        else:
+            response = client.post(url, data=data)
+    queries = [
+        query['sql'] for query in context.captured_queries
+        if not query['sql'].startswith(TRANSACTION_STATEMENTS)
+    ]
+    return queries, response
+
+
+def count_queries(client, url):
+    queries, response = capture_queries(client, url)
+    assert response.status_code == HTTPStatus.OK
+    return len(queries), response.json()
+
+
+def walk(client, url):
+    seen = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data
+        seen.extend(obj['id'] for obj in data['results'])
+        url = data['next']
+    return seen
+
+
+def explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def create_catalog(size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+    return category, genres
+
+
+def create_rated_titles(size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    for idx in range(size):
+        Title.objects.create(
+            name=f'Произведение {idx}',
+            year=2000,
+            category=category,
+            rating_sum=idx % 4,
+            reviews_count=1 if idx % 4 else 0,
+            rating=idx % 4
+        )
+
+
+def seed_catalog():
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(10)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(20)
+    )
+    categories = list(Category.objects.all())
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(
+            name=f'Title {idx}',
+            year=1900 + idx % 120,
+            category=categories[idx % len(categories)],
+            rating=idx % 10
+        )
+        for idx in range(3000)
+    )
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title_id=title_id, genre=genres[(title_id + shift) % 20])
+        for title_id in Title.objects.values_list('id', flat=True)
+        for shift in (0, 7)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def create_discussion(size=100):
+    title = Title.objects.create(name='Произведение', year=2000)
+    User.objects.bulk_create(
+        User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+        for idx in range(size)
+    )
+    users = list(User.objects.filter(username__startswith='author'))
+    Review.objects.bulk_create(
+        Review(title=title, author=user, text='Текст', score=5)
+        for user in users
+    )
+    review = Review.objects.first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Текст') for user in users
+    )
+    return title, review